@@ -2,7 +2,15 @@
 # Module for PDF text extraction
 
 import pdfplumber
+import numpy as np
+import bisect
+import concurrent.futures
 import logging
+import os
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import chain, repeat
 
 # Configure logging for debugging
 logging.basicConfig(
@@ -11,65 +19,232 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class Char:
+    """
+    Compact per-character record built from a pdfplumber char dict.
+
+    __slots__ storage avoids the per-dict hash table (~500 bytes per char),
+    roughly halving resident memory on large documents. Supports get() and
+    [] access so dict-style consumers keep working.
+    """
+    __slots__ = (
+        "x0", "x1", "y0", "y1", "size", "fontname", "text",
+        "non_stroking_color", "stroking_color",
+    )
+
+    def __init__(self, x0, x1, y0, y1, size, fontname, text,
+                 non_stroking_color, stroking_color):
+        self.x0 = x0
+        self.x1 = x1
+        self.y0 = y0
+        self.y1 = y1
+        self.size = size
+        self.fontname = fontname
+        self.text = text
+        self.non_stroking_color = non_stroking_color
+        self.stroking_color = stroking_color
+
+    @classmethod
+    def from_dict(cls, char):
+        return cls(
+            char.get("x0", 0),
+            char.get("x1", 0),
+            char.get("y0", 0),
+            char.get("y1", 0),
+            char.get("size", 12),
+            char.get("fontname", "Unknown"),
+            char.get("text", ""),
+            char.get("non_stroking_color"),
+            char.get("stroking_color"),
+        )
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class PageChars:
+    """
+    Struct-of-Arrays view over one page's pdfplumber character dicts.
+
+    Built once per page so the coordinate/size/text columns are extracted a
+    single time and shared by every downstream pass (font metrics, column
+    detection, line/paragraph grouping) instead of re-walking the dicts.
+    """
+    chars: list  # Compact Char records (kept for record-based consumers)
+    x0: np.ndarray
+    x1: np.ndarray
+    y0: np.ndarray
+    y1: np.ndarray
+    size: np.ndarray
+    text: np.ndarray  # dtype=object
+    fontname_id: np.ndarray  # Index into font_names
+    font_names: list  # Interning table: fontname_id -> fontname string
+    # Lazily cached sort orders, shared by every pass that needs them
+    _order_by_x0: np.ndarray = field(default=None, repr=False)
+    _order_reading: np.ndarray = field(default=None, repr=False)
+
+    def order_by_x0(self):
+        """Stable left-to-right index order, computed once per page."""
+        if self._order_by_x0 is None:
+            self._order_by_x0 = np.argsort(self.x0, kind="stable")
+        return self._order_by_x0
+
+    def order_reading(self):
+        """Stable top-to-bottom, left-to-right index order (-y0, x0)."""
+        if self._order_reading is None:
+            self._order_reading = np.lexsort((self.x0, -self.y0))
+        return self._order_reading
+
+    @classmethod
+    def from_chars(cls, chars, font_ids=None):
+        """
+        Build the SoA view. Pass a shared font_ids dict to intern fontnames
+        document-wide so every page maps the same font to the same id.
+        """
+        chars = list(chars)
+        n = len(chars)
+        x0 = np.empty(n, dtype=np.float64)
+        x1 = np.empty(n, dtype=np.float64)
+        y0 = np.empty(n, dtype=np.float64)
+        y1 = np.empty(n, dtype=np.float64)
+        size = np.empty(n, dtype=np.float64)
+        text = np.empty(n, dtype=object)
+        fontname_id = np.empty(n, dtype=np.intp)
+        if font_ids is None:
+            font_ids = {}
+        records = [None] * n
+        for i, char in enumerate(chars):
+            x0[i] = char.get("x0", 0)
+            x1[i] = char.get("x1", 0)
+            y0[i] = char.get("y0", 0)
+            y1[i] = char.get("y1", 0)
+            size[i] = char.get("size", 12)
+            text[i] = char.get("text", "")
+            # sys.intern so repeated fontnames share one string object and
+            # later key comparisons are pointer-fast
+            name = sys.intern(char.get("fontname", "Unknown"))
+            fontname_id[i] = font_ids.setdefault(name, len(font_ids))
+            # Replace the heavyweight dict with a compact __slots__ record
+            records[i] = Char(
+                char.get("x0", 0), char.get("x1", 0),
+                char.get("y0", 0), char.get("y1", 0),
+                char.get("size", 12), name, char.get("text", ""),
+                char.get("non_stroking_color"), char.get("stroking_color"),
+            )
+        return cls(records, x0, x1, y0, y1, size, text, fontname_id, list(font_ids))
+
+    def __len__(self):
+        return len(self.chars)
+
+
+def _as_page_chars(char_data):
+    """Coerce a raw pdfplumber char list to PageChars (no-op if already one)."""
+    if isinstance(char_data, PageChars):
+        return char_data
+    return PageChars.from_chars(char_data)
+
+
+# Resolved (fontname, size) -> standard_char_width, shared across documents
+# so common fonts skip sample collection on every PDF after the first
+_FONT_WIDTH_CACHE = {}
+
+
 def extract_font_metrics(char_data):
     """
     Extract precise character width measurements from PDF character data.
-    
+
+    Uses a struct-of-arrays pass: character fields are pulled into parallel
+    NumPy arrays once, then widths and outlier masks are computed with vector
+    operations instead of per-character Python loops.
+
     Args:
-        char_data: List of character dictionaries from pdfplumber
-        
+        char_data: List of character dictionaries from pdfplumber, or a
+            PageChars struct-of-arrays view
+
     Returns:
         Dictionary mapping font variants to their character width metrics
     """
     font_metrics = {}
-    
-    for char in char_data:
-        # Create unique key for font variant (family + size)
-        font_name = char.get("fontname", "Unknown")
-        font_size = char.get("size", 12)
+
+    if not len(char_data):
+        return font_metrics
+
+    page_chars = _as_page_chars(char_data)
+    texts = page_chars.text
+    sizes = page_chars.size
+    n = len(page_chars)
+
+    # Vectorized width computation for all characters at once
+    widths = page_chars.x1 - page_chars.x0
+
+    # Skip whitespace and empty chars
+    non_whitespace = np.fromiter(
+        (bool(t) and bool(t.strip()) for t in texts), dtype=bool, count=n
+    )
+
+    # Group characters by font variant (family + size) using the interned ids
+    variants = np.column_stack((page_chars.fontname_id, sizes))
+    unique_variants, inverse = np.unique(variants, axis=0, return_inverse=True)
+
+    for group_idx in range(len(unique_variants)):
+        group = np.flatnonzero(inverse == group_idx)
+        font_name = page_chars.font_names[page_chars.fontname_id[group[0]]]
+        font_size = float(sizes[group[0]])
         font_key = f"{font_name}_{font_size}"
-        
-        # Initialize metrics for this font variant if not exists
-        if font_key not in font_metrics:
-            font_metrics[font_key] = {
-                "font_name": font_name,
-                "font_size": font_size,
-                "standard_char_width": None,  # Width of a representative character for this font
-                "char_samples": [],  # Store multiple samples for better selection
-                "sample_count": 0
-            }
-        
-        metrics = font_metrics[font_key]
-        
-        # Calculate actual character width from bounding box
-        char_text = char.get("text", "")
-        if char_text and char_text.strip():  # Skip whitespace and empty chars
-            actual_width = char.get("x1", 0) - char.get("x0", 0)
-            
-            # Collect samples from first few characters to find a representative width
-            if metrics["standard_char_width"] is None and len(metrics["char_samples"]) < 10:
-                # Only collect reasonable width samples (avoid extreme outliers)
-                expected_range = (font_size * 0.2, font_size * 1.2)  # 20% to 120% of font size
-                if expected_range[0] <= actual_width <= expected_range[1]:
-                    metrics["char_samples"].append({
-                        'width': actual_width, 
-                        'char': char_text,
-                        'sample_index': metrics["sample_count"]
-                    })
-                    
-                    # Once we have 5 reasonable samples, pick the median
-                    if len(metrics["char_samples"]) >= 5:
-                        widths = [s['width'] for s in metrics["char_samples"]]
-                        widths.sort()
-                        median_width = widths[len(widths)//2]  # Pick median for stability
-                        median_sample = next(s for s in metrics["char_samples"] if s['width'] == median_width)
-                        metrics["standard_char_width"] = median_width
-                        logger.debug(f"Captured standard char width for {font_key}: {median_width:.3f}pt from char '{median_sample['char']}' (median of {len(widths)} samples)")
-                        # Clean up samples to save memory
-                        metrics["char_samples"] = []
-            
-            metrics["sample_count"] += 1
-    
+
+        # Only non-whitespace chars contribute width samples
+        sample_chars = group[non_whitespace[group]]
+
+        metrics = {
+            "font_name": font_name,
+            "font_size": font_size,
+            "standard_char_width": None,  # Width of a representative character for this font
+            "char_samples": [],  # Store multiple samples for better selection
+            "sample_count": int(sample_chars.size)
+        }
+
+        # Reuse the width resolved for this font variant by an earlier
+        # document (or page) and skip sample collection entirely
+        cached_width = _FONT_WIDTH_CACHE.get((font_name, font_size))
+        if cached_width is not None:
+            metrics["standard_char_width"] = cached_width
+            font_metrics[font_key] = metrics
+            continue
+
+        sample_widths = widths[sample_chars]
+
+        # Only collect reasonable width samples (avoid extreme outliers)
+        expected_range = (font_size * 0.2, font_size * 1.2)  # 20% to 120% of font size
+        in_range = np.flatnonzero(
+            (sample_widths >= expected_range[0]) & (sample_widths <= expected_range[1])
+        )
+
+        # Once we have 5 reasonable samples, pick the median
+        if in_range.size >= 5:
+            samples = sorted(
+                (float(sample_widths[j]), texts[sample_chars[j]])
+                for j in in_range[:5]
+            )
+            median_width, median_char = samples[len(samples) // 2]  # Pick median for stability
+            metrics["standard_char_width"] = median_width
+            _FONT_WIDTH_CACHE[(font_name, font_size)] = median_width
+            logger.debug(f"Captured standard char width for {font_key}: {median_width:.3f}pt from char '{median_char}' (median of {len(samples)} samples)")
+        else:
+            # Keep the partial (width, char) samples so pages can be merged later
+            metrics["char_samples"] = [
+                (float(sample_widths[j]), texts[sample_chars[j]])
+                for j in in_range
+            ]
+
+        font_metrics[font_key] = metrics
+
     # Log font metrics summary
     for font_key, metrics in font_metrics.items():
         if metrics["sample_count"] > 0 and metrics["standard_char_width"] is not None:
@@ -594,141 +769,313 @@ def is_text_in_table(paragraph_bbox, tables):
         return False  # If error, assume not in table
 
 
-def extract_text_metadata(pdf_path, max_pages=None):
+def _extract_page_data(page, page_number, font_ids=None, include_words=False):
+    """
+    Extract chars, words, tables, and paragraphs from a single open page.
+
+    Returns a per-page dict that extract_text_metadata merges in page order;
+    font-metric references for paragraphs are attached during that merge so
+    they point at the document-level metrics.
+    """
+    # Build the struct-of-arrays view once; every downstream
+    # pass shares it instead of re-walking the char dicts. The pdfplumber
+    # dicts are dropped immediately in favor of compact Char records.
+    page_chars = PageChars.from_chars(page.chars, font_ids=font_ids)
+
+    # Extract font metrics from character data
+    font_metrics = extract_font_metrics(page_chars)
+
+    # Extract words only on request: nothing downstream consumes them and
+    # the word grouping re-walks the same chars the segment detection
+    # below already covers
+    words = page.extract_words() if include_words else []
+
+    # Extract table data using simple debug visualization approach
+    table_result = extract_table_with_debug_visualization(page)
+    table_data = table_result["tables"]
+
+    # Add page number to each table
+    for table in table_data:
+        table["page_number"] = page_number
+
+    # Detect lines and paragraphs
+    lines, paragraphs = detect_lines_and_paragraphs(page_chars)
+
+    # Filter out paragraphs that are part of tables to avoid duplication
+    filtered_paragraphs = []
+    for paragraph in paragraphs:
+        if not is_text_in_table(paragraph["bounding_box"], table_data):
+            paragraph["page_number"] = page_number
+            filtered_paragraphs.append(paragraph)
+        else:
+            logger.debug(f"Filtered out paragraph (part of table): {paragraph['text'][:50]}...")
+
+    return {
+        "page_number": page_number,
+        "font_metrics": font_metrics,
+        "words": words,
+        "tables": table_data,
+        "paragraphs": filtered_paragraphs,
+        "lines": lines,
+        "chars": page_chars.chars,
+    }
+
+
+def _process_page(pdf_path, page_number, include_words=False):
+    """
+    Worker entry point for parallel extraction: open the PDF and extract one
+    page. Everything returned is picklable so it can cross process boundaries.
+    """
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            page = pdf.pages[page_number - 1]
+            return _extract_page_data(page, page_number, include_words=include_words)
+    except Exception as e:
+        logger.error(f"Error processing page {page_number}: {e}")
+        return {
+            "page_number": page_number,
+            "font_metrics": {},
+            "words": [],
+            "tables": [],
+            "paragraphs": [],
+            "lines": [],
+            "chars": [],
+        }
+
+
+def _finalize_pages_data(all_pages_data):
+    """
+    Flatten the per-page char lists accumulated by _merge_page_result and
+    resolve each paragraph's standard char width now that the font metrics
+    from every page have been merged.
+    """
+    chars_pages = all_pages_data.pop("_chars_pages", [])
+    all_pages_data["chars"] = list(chain.from_iterable(chars_pages))
+
+    # Store just the resolved width scalar instead of a reference to the
+    # whole metrics dict, which would bloat paragraph dicts and JSON dumps
+    font_metrics = all_pages_data["font_metrics"]
+    for paragraph in all_pages_data["paragraphs"]:
+        font_key = f"{paragraph.get('font_name', 'Unknown')}_{paragraph.get('font_size', 12)}"
+        metrics = font_metrics.get(font_key)
+        if metrics is not None:
+            paragraph["standard_char_width"] = metrics["standard_char_width"]
+
+    return all_pages_data
+
+
+def _merge_page_result(all_pages_data, result):
+    """
+    Merge one page's extraction result into the aggregated document data.
+    """
+    # Merge font metrics into global metrics
+    for font_key, metrics in result["font_metrics"].items():
+        if font_key not in all_pages_data["font_metrics"]:
+            all_pages_data["font_metrics"][font_key] = metrics
+        else:
+            # Update with more character samples
+            existing = all_pages_data["font_metrics"][font_key]
+
+            # Merge character width samples for better accuracy
+            if existing["standard_char_width"] is None and metrics["standard_char_width"] is not None:
+                existing["standard_char_width"] = metrics["standard_char_width"]
+            elif existing["standard_char_width"] is None:
+                # Merge samples if both still collecting
+                if "char_samples" in existing and "char_samples" in metrics:
+                    existing["char_samples"].extend(metrics["char_samples"])
+
+            existing["sample_count"] += metrics["sample_count"]
+
+    # Add data to the aggregated result
+    all_pages_data["paragraphs"].extend(result["paragraphs"])
+    all_pages_data["lines"].extend(result["lines"])
+    all_pages_data["words"].extend(result["words"])
+    # Chars accumulate as one list per page; _finalize_pages_data flattens
+    # them in a single pass instead of copying pointers page by page
+    all_pages_data.setdefault("_chars_pages", []).append(result["chars"])
+    all_pages_data["tables"].extend(result["tables"])
+
+    logger.debug(
+        f"Processed page {result['page_number']} with {len(result['paragraphs'])} paragraphs, {len(result['tables'])} tables, and {len(result['font_metrics'])} font variants"
+    )
+
+
+def iter_page_chunks(pdf_path, pages_per_chunk=64, max_pages=None, parallel=True,
+                    include_words=False):
+    """
+    Stream extraction results from a PDF in bounded chunks of pages.
+
+    Yields dicts with the same shape as extract_text_metadata's result, each
+    covering up to pages_per_chunk pages, so memory stays bounded on very
+    large PDFs and downstream translation can start before extraction
+    finishes. Font metrics are merged per chunk, not across chunks.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        pages_per_chunk: Number of pages per yielded chunk.
+        max_pages: Maximum number of pages to process (None for all pages).
+        parallel: Process each chunk's pages in worker processes.
+    """
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            num_pages = len(pdf.pages[:max_pages] if max_pages else pdf.pages)
+    except Exception as e:
+        logger.error(f"Error opening PDF file {pdf_path}: {e}")
+        return
+
+    # Shared interning table so every page maps the same fontname to one id
+    doc_font_ids = {}
+
+    for chunk_start in range(1, num_pages + 1, pages_per_chunk):
+        chunk_pages = list(
+            range(chunk_start, min(chunk_start + pages_per_chunk, num_pages + 1))
+        )
+        chunk_data = {"paragraphs": [], "lines": [], "words": [], "chars": [], "font_metrics": {}, "tables": []}
+
+        if parallel and len(chunk_pages) > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(chunk_pages))
+            ) as executor:
+                page_results = list(
+                    executor.map(
+                        _process_page, repeat(pdf_path), chunk_pages,
+                        repeat(include_words),
+                    )
+                )
+        else:
+            page_results = []
+            try:
+                with pdfplumber.open(pdf_path) as pdf:
+                    for page_number in chunk_pages:
+                        try:
+                            page_results.append(
+                                _extract_page_data(
+                                    pdf.pages[page_number - 1],
+                                    page_number,
+                                    font_ids=doc_font_ids,
+                                    include_words=include_words,
+                                )
+                            )
+                        except Exception as e:
+                            logger.error(f"Error processing page {page_number}: {e}")
+            except Exception as e:
+                logger.error(f"Error opening PDF file {pdf_path}: {e}")
+                return
+
+        for result in page_results:
+            _merge_page_result(chunk_data, result)
+        _finalize_pages_data(chunk_data)
+
+        logger.info(
+            f"Yielding chunk of pages {chunk_pages[0]}-{chunk_pages[-1]} with {len(chunk_data['paragraphs'])} paragraphs"
+        )
+        yield chunk_data
+
+
+def extract_text_metadata(pdf_path, max_pages=None, parallel=True, include_words=False):
     """
     Extract text metadata from a PDF file, including character width measurements and table detection.
 
     Args:
         pdf_path: Path to the PDF file.
         max_pages: Maximum number of pages to process (None for all pages).
+        parallel: Process pages in worker processes (the per-page work is
+            CPU-bound and independent, so multi-page PDFs scale with cores).
 
     Returns:
         Dictionary containing text metadata for all processed pages.
     """
     all_pages_data = {"paragraphs": [], "lines": [], "words": [], "chars": [], "font_metrics": {}, "tables": []}
 
+    # Shared interning table so every page maps the same fontname to one id
+    doc_font_ids = {}
+
     try:
         with pdfplumber.open(pdf_path) as pdf:
             # Limit pages if max_pages is specified
             pages_to_process = pdf.pages[:max_pages] if max_pages else pdf.pages
-
-            for page_number, page in enumerate(pages_to_process, start=1):
-                try:
-                    # Extract character-level data
-                    char_data = page.chars
-
-                    # Extract font metrics from character data
-                    font_metrics = extract_font_metrics(char_data)
-                    
-                    # Merge font metrics into global metrics
-                    for font_key, metrics in font_metrics.items():
-                        if font_key not in all_pages_data["font_metrics"]:
-                            all_pages_data["font_metrics"][font_key] = metrics
-                        else:
-                            # Update with more character samples 
-                            existing = all_pages_data["font_metrics"][font_key]
-                            
-                            # Merge character width samples for better accuracy
-                            if existing["standard_char_width"] is None and metrics["standard_char_width"] is not None:
-                                existing["standard_char_width"] = metrics["standard_char_width"]
-                            elif existing["standard_char_width"] is None:
-                                # Merge samples if both still collecting
-                                if "char_samples" in existing and "char_samples" in metrics:
-                                    existing["char_samples"].extend(metrics["char_samples"])
-                            
-                            existing["sample_count"] += metrics["sample_count"]
-
-                    # Extract words
-                    words = page.extract_words()
-
-                    # Extract table data using simple debug visualization approach
-                    table_result = extract_table_with_debug_visualization(page)
-                    table_data = table_result["tables"]
-                    
-                    # Add page number to each table
-                    for table in table_data:
-                        table["page_number"] = page_number
-
-                    # Detect lines and paragraphs
-                    lines, paragraphs = detect_lines_and_paragraphs(char_data)
-
-                    # Filter out paragraphs that are part of tables to avoid duplication
-                    filtered_paragraphs = []
-                    for paragraph in paragraphs:
-                        if not is_text_in_table(paragraph["bounding_box"], table_data):
-                            paragraph["page_number"] = page_number
-                            # Add font metrics reference for precise width calculation
-                            font_key = f"{paragraph.get('font_name', 'Unknown')}_{paragraph.get('font_size', 12)}"
-                            if font_key in all_pages_data["font_metrics"]:
-                                paragraph["font_metrics"] = all_pages_data["font_metrics"][font_key]
-                            filtered_paragraphs.append(paragraph)
-                        else:
-                            logger.debug(f"Filtered out paragraph (part of table): {paragraph['text'][:50]}...")
-                    
-                    paragraphs = filtered_paragraphs
-
-                    # Add data to the aggregated result
-                    all_pages_data["paragraphs"].extend(paragraphs)
-                    all_pages_data["lines"].extend(lines)
-                    all_pages_data["words"].extend(words)
-                    all_pages_data["chars"].extend(char_data)
-                    all_pages_data["tables"].extend(table_data)
-
-                    logger.debug(
-                        f"Processed page {page_number} with {len(paragraphs)} paragraphs, {len(table_data)} tables, and {len(font_metrics)} font variants"
+            num_pages = len(pages_to_process)
+
+            if parallel and num_pages > 1:
+                # Each worker reopens the PDF and extracts a single page
+                page_numbers = list(range(1, num_pages + 1))
+                with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=min(os.cpu_count() or 1, num_pages)
+                ) as executor:
+                    page_results = list(
+                        executor.map(
+                            _process_page, repeat(pdf_path), page_numbers,
+                            repeat(include_words),
+                        )
                     )
-
-                except Exception as e:
-                    logger.error(f"Error processing page {page_number}: {e}")
-
-            logger.info(
-                f"Extracted {len(all_pages_data['paragraphs'])} paragraphs and {len(all_pages_data['tables'])} tables from {len(pages_to_process)} pages"
-            )
-            logger.info(
-                f"Collected font metrics for {len(all_pages_data['font_metrics'])} font variants"
-            )
-            return all_pages_data
+            else:
+                page_results = []
+                for page_number, page in enumerate(pages_to_process, start=1):
+                    try:
+                        page_results.append(
+                            _extract_page_data(
+                                page, page_number,
+                                font_ids=doc_font_ids,
+                                include_words=include_words,
+                            )
+                        )
+                    except Exception as e:
+                        logger.error(f"Error processing page {page_number}: {e}")
 
     except Exception as e:
         logger.error(f"Error opening PDF file {pdf_path}: {e}")
         return all_pages_data
 
+    # Merge page results in page order
+    for result in page_results:
+        _merge_page_result(all_pages_data, result)
+    _finalize_pages_data(all_pages_data)
+
+    logger.info(
+        f"Extracted {len(all_pages_data['paragraphs'])} paragraphs and {len(all_pages_data['tables'])} tables from {len(page_results)} pages"
+    )
+    logger.info(
+        f"Collected font metrics for {len(all_pages_data['font_metrics'])} font variants"
+    )
+    return all_pages_data
+
 
 def detect_columns_by_gaps(chars, page_width):
     """
     Detect column boundaries by analyzing horizontal gaps between characters.
     Returns column boundaries that can handle mixed single/multi-column layouts.
     """
-    if not chars:
+    if not len(chars):
         return [0, page_width]
 
-    # Sort characters by horizontal position
-    sorted_chars = sorted(chars, key=lambda c: c["x0"])
-
-    # Find significant horizontal gaps
-    gaps = []
-    for i in range(1, len(sorted_chars)):
-        prev_char = sorted_chars[i - 1]
-        curr_char = sorted_chars[i]
-        gap_size = curr_char["x0"] - prev_char["x1"]
-
-        # Consider gaps that are larger than typical word spacing
-        avg_char_width = prev_char.get("size", 12) * 0.6  # Approximate character width
-        min_gap_threshold = avg_char_width * 1.5  # Even more reduced threshold
-
-        if gap_size > min_gap_threshold:
-            gaps.append(
-                {
-                    "position": (prev_char["x1"] + curr_char["x0"]) / 2,
-                    "size": gap_size,
-                    "y_range": (
-                        min(prev_char["y0"], curr_char["y0"]),
-                        max(prev_char["y1"], curr_char["y1"]),
-                    ),
-                    "prev_x1": prev_char["x1"],
-                    "curr_x0": curr_char["x0"],
-                }
-            )
+    # Reuse the cached coordinate arrays and sort by horizontal position
+    page_chars = _as_page_chars(chars)
+    x0, x1, y0, y1 = page_chars.x0, page_chars.x1, page_chars.y0, page_chars.y1
+    sizes = page_chars.size
+
+    order = page_chars.order_by_x0()
+    sx0, sx1, sy0, sy1 = x0[order], x1[order], y0[order], y1[order]
+
+    # Vectorized gap scan: gaps larger than typical word spacing
+    gap_sizes = sx0[1:] - sx1[:-1]
+    avg_char_widths = sizes[order][:-1] * 0.6  # Approximate character width
+    min_gap_thresholds = avg_char_widths * 1.5  # Even more reduced threshold
+    gap_indices = np.flatnonzero(gap_sizes > min_gap_thresholds)
+
+    # Only the surviving gaps (typically dozens) need Python-level dicts
+    gaps = [
+        {
+            "position": (sx1[i] + sx0[i + 1]) / 2,
+            "size": gap_sizes[i],
+            "y_range": (
+                min(sy0[i], sy0[i + 1]),
+                max(sy1[i], sy1[i + 1]),
+            ),
+            "prev_x1": sx1[i],
+            "curr_x0": sx0[i + 1],
+        }
+        for i in gap_indices
+    ]
 
     if not gaps:
         logger.debug("No significant gaps found - treating as single column")
@@ -751,7 +1098,8 @@ def detect_columns_by_gaps(chars, page_width):
 
     # Analyze each gap group for column separation potential
     column_gaps = []
-    page_height = max(c["y1"] for c in chars) - min(c["y0"] for c in chars)
+    # Content height from the cached arrays instead of two generator scans
+    page_height = float(y1.max() - y0.min())
 
     for gap_group in gap_groups:
         # Calculate average properties of gap group
@@ -805,117 +1153,127 @@ def detect_columns_by_gaps(chars, page_width):
 def group_chars_by_columns(chars, column_boundaries):
     """
     Group characters into columns based on boundaries.
+
+    Character centers are computed once from the cached coordinate arrays and
+    binned against the boundaries with a single np.searchsorted call; the
+    clip handles out-of-range centers by assigning the nearest edge column.
     """
     columns = [[] for _ in range(len(column_boundaries) - 1)]
 
-    for char in chars:
-        char_center_x = (char["x0"] + char["x1"]) / 2
-
-        # Find which column this character belongs to
-        for i in range(len(column_boundaries) - 1):
-            if column_boundaries[i] <= char_center_x < column_boundaries[i + 1]:
-                columns[i].append(char)
-                break
-        else:
-            # If not within any boundary, assign to closest column
-            closest_col = min(
-                range(len(columns)),
-                key=lambda i: min(
-                    abs(char_center_x - column_boundaries[i]),
-                    abs(char_center_x - column_boundaries[i + 1]),
-                ),
-            )
-            columns[closest_col].append(char)
+    if not len(chars):
+        return columns
+
+    page_chars = _as_page_chars(chars)
+    centers = (page_chars.x0 + page_chars.x1) * 0.5
+    boundaries = np.asarray(column_boundaries, dtype=np.float64)
+    col_idx = np.searchsorted(boundaries, centers, side="right") - 1
+    np.clip(col_idx, 0, len(column_boundaries) - 2, out=col_idx)
+
+    # Build each column right-sized in one pass: a stable sort by column
+    # index groups the chars, and the bincount offsets split the groups
+    records = page_chars.chars
+    counts = np.bincount(col_idx, minlength=len(columns))
+    order = np.argsort(col_idx, kind="stable")
+    offsets = np.cumsum(counts[:-1])
+    columns = [
+        [records[i] for i in group] for group in np.split(order, offsets)
+    ]
 
     return columns
 
 
+def _segment_line(x0, x1, size, min_gap=20.0):
+    """
+    Vectorized gap kernel for one line of left-to-right sorted chars.
+
+    Returns the indices where a new segment starts (suitable for np.split):
+    a break occurs where the gap to the previous char exceeds the dynamic
+    threshold of at least min_gap points or 2x the font size.
+    """
+    if len(x0) < 2:
+        return np.empty(0, dtype=np.intp)
+    gaps = x0[1:] - x1[:-1]
+    thresholds = np.maximum(min_gap, size[1:] * 2)
+    return np.flatnonzero(gaps > thresholds) + 1
+
+
 def detect_lines_and_paragraphs(chars):
     """
     Group characters into lines and paragraphs using line-first column detection.
     This approach groups by Y-position first, then analyzes gaps within lines.
+    Accepts either a raw pdfplumber char list or a PageChars view.
     """
-    if not chars:
+    if not len(chars):
         return [], []
 
+    page_chars = _as_page_chars(chars)
+    chars = page_chars.chars
+
     logger.debug(f"Processing {len(chars)} characters for line and paragraph detection")
 
-    # Step 1: Group characters by vertical position (lines)
-    lines_by_y = {}
-    for char in chars:
-        y_pos = round(char["y0"], 1)  # Round to nearest 0.1 point for grouping
-        if y_pos not in lines_by_y:
-            lines_by_y[y_pos] = []
-        lines_by_y[y_pos].append(char)
+    # Step 1: Group character indices by vertical position (lines).
+    # Iterating in the shared left-to-right order means each line's chars
+    # come out already sorted, so no per-line re-sort is needed below.
+    lines_by_y = defaultdict(list)
+    for i in page_chars.order_by_x0():
+        y_pos = round(chars[i].y0, 1)  # Round to nearest 0.1 point for grouping
+        lines_by_y[y_pos].append(i)
 
     logger.debug(f"Found {len(lines_by_y)} distinct Y-positions (lines)")
 
-    # Step 2: Analyze each line for column patterns
+    # Step 2: Analyze each line for column patterns; the gap/threshold
+    # comparisons run as one vectorized kernel per line
     column_segments = []
     sorted_y_positions = sorted(lines_by_y.keys(), reverse=True)  # Top to bottom
+    x0a, x1a = page_chars.x0, page_chars.x1
 
     for y_pos in sorted_y_positions:
-        line_chars = sorted(lines_by_y[y_pos], key=lambda c: c["x0"])  # Left to right
-
-        # Find gaps within this line
-        line_segments = []
-        current_segment = []
-
-        for i, char in enumerate(line_chars):
-            if not current_segment:
-                current_segment.append(char)
-            else:
-                # Check gap between current char and previous char
-                prev_char = current_segment[-1]
-                gap_size = char["x0"] - prev_char["x1"]
-
-                # Use dynamic threshold based on font size
-                threshold = max(
-                    20, char.get("size", 12) * 2
-                )  # At least 20 points or 2x font size
-
-                if gap_size > threshold:
-                    # Large gap found - end current segment and start new one
-                    line_segments.append(current_segment)
-                    current_segment = [char]
-                else:
-                    current_segment.append(char)
+        line_idx = np.asarray(lines_by_y[y_pos], dtype=np.intp)  # Already left to right
 
-        if current_segment:
-            line_segments.append(current_segment)
+        # Find gaps within this line and split into segments
+        breaks = _segment_line(
+            x0a[line_idx], x1a[line_idx], page_chars.size[line_idx]
+        )
 
         # Store segments with their Y position
-        for seg_idx, segment in enumerate(line_segments):
+        for seg_idx, seg_indices in enumerate(np.split(line_idx, breaks)):
             column_segments.append(
                 {
                     "y_pos": y_pos,
                     "column": seg_idx,
-                    "chars": segment,
-                    "x_start": min(c["x0"] for c in segment),
-                    "x_end": max(c["x1"] for c in segment),
-                    "text": "".join(c["text"] for c in segment),
+                    "chars": [chars[j] for j in seg_indices],
+                    "x_start": float(x0a[seg_indices].min()),
+                    "x_end": float(x1a[seg_indices].max()),
+                    "text": "".join(chars[j].text for j in seg_indices),
                 }
             )
 
     logger.debug(f"Created {len(column_segments)} column segments")
 
     # Step 3: Group segments by column based on horizontal alignment
-    column_groups = {}
+    column_groups = defaultdict(list)
+    sorted_col_keys = []  # Kept sorted so the nearest column is a bisect away
 
     for segment in column_segments:
         # Find which column this segment belongs to based on x_start position
+        x_start = segment["x_start"]
         col_key = None
 
-        # Look for existing column with similar x_start (within 50 points)
-        for existing_col in column_groups.keys():
-            if abs(segment["x_start"] - existing_col) < 50:
-                col_key = existing_col
-                break
+        # Look for the nearest existing column with similar x_start
+        # (within 50 points); only the two bisect neighbors can qualify
+        idx = bisect.bisect_left(sorted_col_keys, x_start)
+        best_dist = 50
+        for j in (idx - 1, idx):
+            if 0 <= j < len(sorted_col_keys):
+                dist = abs(x_start - sorted_col_keys[j])
+                if dist < best_dist:
+                    best_dist = dist
+                    col_key = sorted_col_keys[j]
 
         # If no existing column found, create new one
         if col_key is None:
-            col_key = segment["x_start"]
-            column_groups[col_key] = []
+            col_key = x_start
+            bisect.insort(sorted_col_keys, col_key)
 
         column_groups[col_key].append(segment)
 
@@ -949,7 +1307,7 @@ def detect_lines_and_paragraphs(chars):
 
                 # Use font size to determine paragraph breaks
                 font_size = (
-                    segment["chars"][0].get("size", 12) if segment["chars"] else 12
+                    segment["chars"][0].size if segment["chars"] else 12
                 )
                 paragraph_threshold = font_size * 1.5  # 1.5x font size
 
@@ -976,19 +1334,32 @@ def detect_lines_and_paragraphs(chars):
                 paragraph[0]["chars"][0] if paragraph and paragraph[0]["chars"] else {}
             )
 
-            # Calculate bounding box
-            all_chars = [char for seg in paragraph for char in seg["chars"]]
-            x0 = min(c["x0"] for c in all_chars)
-            y0 = min(c["y0"] for c in all_chars)
-            x1 = max(c["x1"] for c in all_chars)
-            y1 = max(c["y1"] for c in all_chars)
+            # Calculate bounding box in a single fused pass over the chars
+            x0 = y0 = float("inf")
+            x1 = y1 = float("-inf")
+            for seg in paragraph:
+                for c in seg["chars"]:
+                    if c.x0 < x0:
+                        x0 = c.x0
+                    if c.y0 < y0:
+                        y0 = c.y0
+                    if c.x1 > x1:
+                        x1 = c.x1
+                    if c.y1 > y1:
+                        y1 = c.y1
 
             # Count the number of lines in this paragraph
             num_lines = len(paragraph)
 
-            # Count number of distinct y-positions (more accurate line count)
-            y_positions = set(round(seg["y_pos"], 1) for seg in paragraph)
-            distinct_lines = len(y_positions)
+            # Count distinct y-positions (more accurate line count); segments
+            # arrive sorted by y_pos, so counting value changes avoids
+            # building a set per paragraph
+            distinct_lines = 1
+            last_y = paragraph[0]["y_pos"]
+            for seg in paragraph[1:]:
+                if seg["y_pos"] != last_y:
+                    distinct_lines += 1
+                    last_y = seg["y_pos"]
 
             formatted_paragraph = {
                 "text": paragraph_text,
@@ -1037,11 +1408,22 @@ def sort_groups_by_reading_order(groups, page_height):
 
     This ensures correct translation sequence regardless of initial grouping
     """
-    for group in groups:
-        group["reading_order_score"] = calculate_reading_order_score(group, page_height)
+    if not groups:
+        return []
+
+    # Score all groups in one vectorized call and sort by argsort; the
+    # stable kind keeps tied groups in their original relative order like
+    # the previous reverse=True Python sort did
+    n = len(groups)
+    center_x = np.fromiter((g["center_x"] for g in groups), dtype=np.float64, count=n)
+    center_y = np.fromiter((g["center_y"] for g in groups), dtype=np.float64, count=n)
+    scores = (page_height - center_y) * 1000 + center_x
+
+    for group, score in zip(groups, scores):
+        group["reading_order_score"] = float(score)
 
-    sorted_groups = sorted(groups, key=lambda g: g["reading_order_score"], reverse=True)
-    return sorted_groups
+    order = np.argsort(-scores, kind="stable")
+    return [groups[i] for i in order]
 
 
 def detect_columns(chars, page_width):
@@ -1055,13 +1437,15 @@ def detect_columns(chars, page_width):
     Returns:
         List of column boundaries (x-coordinates).
     """
-    # Sort characters by their horizontal position (x0)
-    chars = sorted(chars, key=lambda c: c["x0"])
+    # Walk characters in the shared left-to-right order
+    page_chars = _as_page_chars(chars)
+    records = page_chars.chars
 
     # Identify large horizontal gaps to determine column boundaries
     column_boundaries = []
     last_x1 = 0
-    for char in chars:
+    for i in page_chars.order_by_x0():
+        char = records[i]
         if (
             char["x0"] - last_x1 > page_width * 0.03
         ):  # Adjusted gap threshold (3% of page width)
@@ -1084,24 +1468,18 @@ def assign_to_columns(chars, column_boundaries):
     Returns:
         List of columns, each containing a list of characters.
     """
-    columns = [[] for _ in range(len(column_boundaries) - 1)]
+    num_columns = len(column_boundaries) - 1
+    columns = [[] for _ in range(num_columns)]
 
     for char in chars:
-        assigned = False
-        for i in range(len(column_boundaries) - 1):
-            if column_boundaries[i] <= char["x0"] < column_boundaries[i + 1]:
-                columns[i].append(char)
-                assigned = True
-                break
-        if not assigned:
-            # Assign to the closest column if not within boundaries
-            closest_index = min(
-                range(len(column_boundaries) - 1),
-                key=lambda i: abs(
-                    (column_boundaries[i] + column_boundaries[i + 1]) / 2 - char["x0"]
-                ),
-            )
-            columns[closest_index].append(char)
+        # Binary-search the boundary list; the clamp assigns out-of-range
+        # chars to the nearest edge column
+        idx = bisect.bisect_right(column_boundaries, char["x0"]) - 1
+        if idx < 0:
+            idx = 0
+        elif idx > num_columns - 1:
+            idx = num_columns - 1
+        columns[idx].append(char)
 
     for i, column in enumerate(columns):
         logger.debug(f"Column {i + 1}: {len(column)} characters")
@@ -1113,11 +1491,17 @@ def group_characters_for_translation(chars, page_width, page_height):
     """
     Main grouping function prioritizing reading order correctness and handling multi-column layouts.
     """
+    page_chars = _as_page_chars(chars)
+
     # Step 1: Detect columns
-    column_boundaries = detect_columns(chars, page_width)
+    column_boundaries = detect_columns(page_chars, page_width)
 
-    # Step 2: Assign characters to columns
-    columns = assign_to_columns(chars, column_boundaries)
+    # Step 2: Assign characters to columns. Feeding them in the shared
+    # reading order (top-to-bottom, left-to-right) means each column comes
+    # out pre-sorted and needs no per-column re-sort.
+    records = page_chars.chars
+    ordered_chars = [records[i] for i in page_chars.order_reading()]
+    columns = assign_to_columns(ordered_chars, column_boundaries)
 
     # Step 3: Group characters within each column
     final_groups = []
@@ -1125,9 +1509,6 @@ def group_characters_for_translation(chars, page_width, page_height):
         clusters = []
         current_cluster = []
 
-        # Sort characters by vertical position (y0) and then horizontal position (x0)
-        column = sorted(column, key=lambda c: (-c["y0"], c["x0"]))
-
         for char in column:
             if not current_cluster:
                 current_cluster.append(char)
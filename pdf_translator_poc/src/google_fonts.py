@@ -4,16 +4,17 @@
 
 import os
 import json
-import urllib.request
+import re
+import shutil
 import urllib.parse
 import logging
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -24,6 +25,21 @@ GOOGLE_FONTS_API_URL = "https://www.googleapis.com/webfonts/v1/webfonts"
 GOOGLE_FONTS_API_KEY = None  # Disabled to avoid API errors
 FONTS_CACHE_DIR = "fonts_cache"
 
+# Pattern for the font file URL inside Google Fonts CSS, compiled once
+_SRC_URL_RE = re.compile(r"src:\s*url\((.+?)\)")
+
+# Recognized dash-separated style suffixes (e.g. "Arial-Bold"); the regex
+# splits family and style and validates the suffix in a single pass
+_STYLE_SUFFIX_RE = re.compile(
+    r"^(.*)-(bold|italic|bolditalic|light|medium|regular)$", re.IGNORECASE
+)
+
+# Shared connection pool so the API, CSS, and TTF requests reuse TLS
+# connections instead of paying a handshake per call
+_HTTP = urllib3.PoolManager(
+    maxsize=8, retries=urllib3.Retry(3, backoff_factor=0.3)
+)
+
 # Font family mapping for common PDF fonts
 PDF_FONT_TO_GOOGLE_FONT = {
     "times": "Times New Roman",
@@ -82,10 +98,18 @@ def parse_font_name_and_style(font_name):
     """
     if not font_name:
         return "Helvetica", "400"
-        
+
+    # Font names repeat heavily within a document, so the cached parse
+    # handles everything past the empty-name default
+    return _parse_font_name_and_style_cached(font_name)
+
+
+@lru_cache(maxsize=512)
+def _parse_font_name_and_style_cached(font_name):
+    """Cached worker for parse_font_name_and_style (font_name is truthy)."""
     # Clean up the font name
     font_name = font_name.strip()
-    
+
     # Handle comma-separated style (e.g., "Times New Roman,Bold")
     if "," in font_name:
         family, style = font_name.split(",", 1)
@@ -93,11 +117,10 @@ def parse_font_name_and_style(font_name):
         style = style.strip().lower()
     # Handle dash-separated style (e.g., "Arial-Bold")
     elif "-" in font_name:
-        parts = font_name.rsplit("-", 1)
-        if len(parts) == 2 and parts[1].lower() in ["bold", "italic", "bolditalic", "light", "medium", "regular"]:
-            family, style = parts
-            family = family.strip()
-            style = style.strip().lower()
+        match = _STYLE_SUFFIX_RE.match(font_name)
+        if match:
+            family = match.group(1).strip()
+            style = match.group(2).lower()
         else:
             family = font_name
             style = "regular"
@@ -111,15 +134,27 @@ def parse_font_name_and_style(font_name):
     # Map style to Google Fonts CSS v2 format
     google_fonts_style = STYLE_MAPPING.get(style, "400")  # Default to regular weight
     
-    logger.debug(f"Parsed font: '{font_name}' -> family='{family}', style='{style}', google_style='{google_fonts_style}'")
+    logger.debug("Parsed font: '%s' -> family='%s', style='%s', google_style='%s'", font_name, family, style, google_fonts_style)
     
     return family, google_fonts_style
 
 
+# Lowercased family -> font dict, built once per API response for O(1)
+# exact-match lookups in find_similar_font; _FONTS_PREFIX buckets families
+# by their first three characters so partial matching scans a handful of
+# candidates instead of the whole list
+_FONTS_BY_LOWER = None
+_FONTS_PREFIX = None
+
+
+@lru_cache(maxsize=1)
 def get_font_list():
     """
     Get a list of all available Google Fonts
 
+    The result is memoized so repeated font lookups within a run share a
+    single API round-trip.
+
     Returns:
         List of font families or None if API call fails
     """
@@ -134,11 +169,16 @@ def get_font_list():
         )
         url = f"{GOOGLE_FONTS_API_URL}?{params}"
 
-        logger.debug(f"Requesting font list from Google Fonts API: {url}")
+        logger.debug("Requesting font list from Google Fonts API: %s", url)
 
-        # Make API request
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
+        # Make API request; urllib3 does not raise on HTTP errors the way
+        # urlopen did, so check the status before trusting the body
+        response = _HTTP.request("GET", url)
+        if response.status != 200:
+            raise urllib3.exceptions.HTTPError(
+                f"Google Fonts API returned HTTP {response.status}"
+            )
+        data = json.loads(response.data.decode())
 
         # Extract font families
         fonts = data.get("items", [])
@@ -150,16 +190,22 @@ def get_font_list():
         return None
 
 
+@lru_cache(maxsize=256)
 def find_similar_font(font_name):
     """
     Find a similar Google Font based on the extracted PDF font name
 
+    Results are memoized per font name, so each unique name pays for the
+    match (and any API fetch behind it) at most once per run.
+
     Args:
         font_name: Font name extracted from PDF
 
     Returns:
         Dictionary with matched font information or None if no match
     """
+    global _FONTS_BY_LOWER, _FONTS_PREFIX
+
     try:
         # Clean up font name for matching
         if not font_name:
@@ -171,30 +217,36 @@ def find_similar_font(font_name):
         # Check direct mapping first
         mapped_name = PDF_FONT_TO_GOOGLE_FONT.get(clean_name.replace(" ", ""))
         if mapped_name:
-            logger.debug(f"Found direct mapping from '{clean_name}' to '{mapped_name}'")
+            logger.debug("Found direct mapping from '%s' to '%s'", clean_name, mapped_name)
             return {"family": mapped_name}
 
-        # Get font list from API
+        # Get font list from API (memoized)
         fonts = get_font_list()
         if not fonts:
             logger.warning("Could not retrieve font list for matching")
             return None
 
-        # Look for exact match first
-        for font in fonts:
-            if font["family"].lower() == clean_name:
-                logger.debug(f"Found exact match for '{clean_name}': {font['family']}")
-                return font
-
-        # Look for partial match
-        for font in fonts:
-            if clean_name in font["family"].lower():
+        # Look for exact match first via the prebuilt lowercase index
+        if _FONTS_BY_LOWER is None:
+            _FONTS_BY_LOWER = {font["family"].lower(): font for font in fonts}
+            _FONTS_PREFIX = defaultdict(list)
+            for family_lower, font in _FONTS_BY_LOWER.items():
+                _FONTS_PREFIX[family_lower[:3]].append((family_lower, font))
+
+        exact = _FONTS_BY_LOWER.get(clean_name)
+        if exact:
+            logger.debug("Found exact match for '%s': %s", clean_name, exact["family"])
+            return exact
+
+        # Look for partial match inside the small same-prefix bucket
+        for family_lower, font in _FONTS_PREFIX.get(clean_name[:3], ()):
+            if clean_name in family_lower:
                 logger.debug(
                     f"Found partial match for '{clean_name}': {font['family']}"
                 )
                 return font
 
-        logger.debug(f"No match found for '{clean_name}', using default")
+        logger.debug("No match found for '%s', using default", clean_name)
         return None
 
     except Exception as e:
@@ -202,6 +254,19 @@ def find_similar_font(font_name):
         return None
 
 
+def _font_cache_path(font_dir, font_family, style_specification):
+    """
+    Build the on-disk cache path for a font family/style pair.
+
+    Shared by the existence check in _get_or_download_font and the download
+    target in download_font, so the two can never disagree on the filename.
+    """
+    font_dir = font_dir or FONTS_CACHE_DIR
+    safe_family = font_family.replace(" ", "")
+    safe_style = style_specification.replace(",", "").replace(" ", "")
+    return os.path.join(font_dir, f"{safe_family}-{safe_style}.ttf")
+
+
 def download_font(
     font_family, style_specification="400", subset="vietnamese,latin", font_dir=None
 ):
@@ -224,6 +289,13 @@ def download_font(
 
         os.makedirs(font_dir, exist_ok=True)
 
+        file_path = _font_cache_path(font_dir, font_family, style_specification)
+
+        # Skip the CSS and font fetches entirely if the TTF is already cached
+        if os.path.exists(file_path):
+            logger.debug("Font already downloaded: %s", file_path)
+            return file_path
+
         # Build CSS v1 URL to get TTF files instead of WOFF2
         # Google Fonts CSS v1 API is more reliable for TTF delivery
         family_encoded = font_family.replace(" ", "+")
@@ -248,33 +320,51 @@ def download_font(
             "User-Agent": "python-requests/2.28.1"
         }
 
-        # Get CSS file with font URL
-        req = urllib.request.Request(css_url, headers=headers)
-        with urllib.request.urlopen(req) as response:
-            css = response.read().decode("utf-8")
+        # Get CSS file with font URL; a non-200 body would otherwise fall
+        # through to the URL regex and report a misleading "no URL" error
+        response = _HTTP.request("GET", css_url, headers=headers)
+        if response.status != 200:
+            raise urllib3.exceptions.HTTPError(
+                f"CSS request for {font_family} returned HTTP {response.status}"
+            )
+        css = response.data.decode("utf-8")
 
         # Extract font URL from CSS
-        import re
-
-        font_url_match = re.search(r"src: url\((.+?)\)", css)
+        font_url_match = _SRC_URL_RE.search(css)
         if not font_url_match:
             logger.error(f"Could not find font URL in CSS for {font_family}")
             return None
 
         font_url = font_url_match.group(1)
 
-        # Generate safe filename based on family and style specification  
-        safe_family = font_family.replace(" ", "")
-        safe_style = style_specification.replace(",", "").replace(" ", "")
-        filename = f"{safe_family}-{safe_style}.ttf"
-        file_path = os.path.join(font_dir, filename)
-
-        # Download the font file
+        # Stream the font file to disk in chunks; CJK fonts can run to
+        # several megabytes and never need to be held in memory whole
         logger.info(f"Downloading {font_family} (style: {style_specification}) from {font_url}")
-        req = urllib.request.Request(font_url, headers=headers)
-        with urllib.request.urlopen(req) as response, open(file_path, "wb") as out_file:
-            data = response.read()
-            out_file.write(data)
+        response = _HTTP.request(
+            "GET", font_url, headers=headers, preload_content=False
+        )
+        part_path = file_path + ".part"
+        try:
+            if response.status != 200:
+                raise urllib3.exceptions.HTTPError(
+                    f"Font download for {font_family} returned HTTP {response.status}"
+                )
+            try:
+                with open(part_path, "wb") as out_file:
+                    shutil.copyfileobj(response, out_file, 65536)
+            except BaseException:
+                # Never leave a truncated file behind: the cache-first
+                # checks would treat it as a permanent hit
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+                raise
+        finally:
+            response.release_conn()
+
+        # Publish atomically so the cache path only ever holds complete fonts
+        os.replace(part_path, file_path)
 
         logger.info(f"Font downloaded to {file_path}")
         return file_path
@@ -284,6 +374,39 @@ def download_font(
         return None
 
 
+# Background pool and in-flight futures for speculative font downloads;
+# keyed so a prefetch and a later blocking call share one download
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4)
+_PREFETCH_FUTURES = {}
+
+
+def prefetch_font_async(font_name, target_language=None, font_dir=None):
+    """
+    Start downloading a font on a background thread and return immediately
+
+    Callers can fire this as soon as a font name is discovered (e.g. during
+    page-1 extraction) so the download overlaps CPU-bound work; a later
+    get_or_download_font call for the same font joins the in-flight download
+    instead of re-issuing it.
+
+    Args:
+        font_name: Font name extracted from PDF
+        target_language: Target language code (e.g., 'vi', 'ja')
+        font_dir: Directory to save font files
+
+    Returns:
+        concurrent.futures.Future resolving to (font_path, font_family_name)
+    """
+    key = (font_name, target_language, font_dir)
+    future = _PREFETCH_FUTURES.get(key)
+    if future is None:
+        future = _PREFETCH_POOL.submit(
+            _get_or_download_font, font_name, font_dir, target_language
+        )
+        _PREFETCH_FUTURES[key] = future
+    return future
+
+
 def get_or_download_font(
     font_name, style="regular", font_dir=None, target_language=None
 ):
@@ -299,11 +422,21 @@ def get_or_download_font(
     Returns:
         Tuple of (font_path, font_family_name) or (None, fallback_font_name)
     """
+    # Join an in-flight (or completed) prefetch for this font if one exists
+    future = _PREFETCH_FUTURES.get((font_name, target_language, font_dir))
+    if future is not None:
+        return future.result()
+
+    return _get_or_download_font(font_name, font_dir, target_language)
+
+
+def _get_or_download_font(font_name, font_dir, target_language):
+    """Resolve and download a font without consulting the prefetch futures."""
     try:
         # Parse the font name to extract family and style
         parsed_family, style_specification = parse_font_name_and_style(font_name)
         
-        logger.debug(f"Parsed font name '{font_name}' -> family='{parsed_family}', style_spec='{style_specification}'")
+        logger.debug("Parsed font name '%s' -> family='%s', style_spec='%s'", font_name, parsed_family, style_specification)
         
         # Determine the best subset based on target language
         subset = "latin"
@@ -318,20 +451,12 @@ def get_or_download_font(
         if similar_font:
             font_family = similar_font["family"]
 
-            # Create safe filename for checking existing downloads
-            safe_family = font_family.replace(" ", "")
-            safe_style = style_specification.replace(",", "").replace(" ", "")
-            filename = f"{safe_family}-{safe_style}.ttf"
-
-            # Check if already downloaded
-            if not font_dir:
-                font_dir = FONTS_CACHE_DIR
-
-            os.makedirs(font_dir, exist_ok=True)
-            file_path = os.path.join(font_dir, filename)
+            # Check if already downloaded; download_font creates the
+            # directory if the download actually runs
+            file_path = _font_cache_path(font_dir, font_family, style_specification)
 
             if os.path.exists(file_path):
-                logger.debug(f"Font already downloaded: {file_path}")
+                logger.debug("Font already downloaded: %s", file_path)
                 return file_path, font_family
 
             # Download the font with the specific style
@@ -348,10 +473,47 @@ def get_or_download_font(
         return None, "Helvetica"
 
 
+def prefetch_fonts(font_names, target_language=None, font_dir=None):
+    """
+    Download several fonts concurrently, warming the on-disk cache
+
+    Font downloads are network-bound, so fetching the distinct styles of a
+    document in parallel (regular, bold, italic, ...) takes roughly as long
+    as the slowest single download instead of their sum.
+
+    Args:
+        font_names: Iterable of font names as extracted from the PDF
+        target_language: Target language code (e.g., 'vi', 'ja')
+        font_dir: Directory to save font files
+
+    Returns:
+        Dictionary mapping each font name to its (font_path, font_family)
+        result from get_or_download_font
+    """
+    font_names = list(font_names)
+    if not font_names:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(8, len(font_names))) as executor:
+        results = executor.map(
+            lambda name: get_or_download_font(
+                name, target_language=target_language, font_dir=font_dir
+            ),
+            font_names,
+        )
+        return dict(zip(font_names, results))
+
+
 # For testing
 if __name__ == "__main__":
     import sys
 
+    # Configure logging only when run as a script, not on import
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
     if len(sys.argv) > 1:
         font_name = sys.argv[1]
         style = sys.argv[2] if len(sys.argv) > 2 else "regular"
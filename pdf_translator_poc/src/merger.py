@@ -1,28 +1,60 @@
 # merger.py
 # Module for final PDF assembly
 
+import concurrent.futures
+import io
 import os
 import logging
-import tempfile
 import shutil
+from functools import lru_cache
 from PyPDF2 import PdfReader, PdfWriter, errors
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# pikepdf wraps QPDF (C++), so page overlays run at near-native speed;
+# fall back to the pure-Python PyPDF2 path when it is not installed
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _cached_reader(path, mtime):
+    return PdfReader(path)
+
+
+def _reader(path):
+    """
+    Shared PdfReader for read-only access to a PDF.
+
+    Parsing is the most expensive step after page merging, so workflows
+    that touch the same file several times (merge, verify, info) reuse one
+    reader. Keyed on mtime so a rewritten file invalidates automatically.
+    Only safe for readers whose pages are never mutated — merge_page
+    modifies the original reader's pages in place, so those stay fresh.
+    """
+    return _cached_reader(path, os.path.getmtime(path))
+
+
 def _copy_temp_to_output(temp_path, output_pdf_path):
     """
-    Helper function to safely copy a temporary PDF file to the final output location.
-    Works across different drives by using copy instead of rename.
+    Helper function to safely move a temporary PDF file to the final output location.
+    Uses an atomic rename on the same filesystem and falls back to copying
+    across different drives.
 
     Args:
         temp_path: Path to the temporary PDF file
         output_pdf_path: Path where the final PDF should be saved
     """
+    try:
+        # Atomic rename: no second write of the merged PDF
+        os.replace(temp_path, output_pdf_path)
+        return output_pdf_path
+    except OSError:
+        # temp and output live on different filesystems
+        pass
+
     # Remove the target file if it already exists
     if os.path.exists(output_pdf_path):
         os.remove(output_pdf_path)
@@ -36,6 +68,23 @@ def _copy_temp_to_output(temp_path, output_pdf_path):
     return output_pdf_path
 
 
+def _overlay_is_blank(overlay_page):
+    """
+    Check whether an overlay page carries no drawable content.
+
+    Pages with nothing to translate produce empty overlay pages; skipping
+    them avoids parsing and rewriting content streams for no effect.
+    """
+    try:
+        contents = overlay_page.get_contents()
+        if contents is None:
+            return True
+        return len(contents.get_data()) == 0
+    except Exception:
+        # When in doubt, merge normally
+        return False
+
+
 # Function to merge original and overlay PDFs
 def merge_pdfs(original_pdf_path, overlay_pdf_path, output_pdf_path):
     """
@@ -60,9 +109,15 @@ def merge_pdfs(original_pdf_path, overlay_pdf_path, output_pdf_path):
         if not os.path.exists(overlay_pdf_path):
             raise FileNotFoundError(f"Overlay PDF not found: {overlay_pdf_path}")
 
+        # Prefer the QPDF-backed merge when pikepdf is available
+        if pikepdf is not None:
+            return _merge_pdfs_pikepdf(
+                original_pdf_path, overlay_pdf_path, output_pdf_path
+            )
+
         # Open the PDF files
         original_reader = PdfReader(original_pdf_path)
-        overlay_reader = PdfReader(overlay_pdf_path)
+        overlay_reader = _reader(overlay_pdf_path)
         writer = PdfWriter()
 
         # Check page count mismatch
@@ -72,30 +127,29 @@ def merge_pdfs(original_pdf_path, overlay_pdf_path, output_pdf_path):
                 f"overlay has {len(overlay_reader.pages)} pages"
             )
 
-        # Merge pages
+        # Merge pages, skipping overlay pages with no content
         for i, page in enumerate(original_reader.pages):
-            if i < len(overlay_reader.pages):
-                logger.debug(f"Merging page {i+1}")
-                page.merge_page(overlay_reader.pages[i])
-            else:
+            if i >= len(overlay_reader.pages):
                 logger.warning(f"No overlay for page {i+1}, keeping original")
+            elif _overlay_is_blank(overlay_reader.pages[i]):
+                logger.debug("Overlay page %d is blank, keeping original", i + 1)
+            else:
+                logger.debug("Merging page %d", i + 1)
+                page.merge_page(overlay_reader.pages[i])
             writer.add_page(page)
 
-        # Use a temporary file to avoid issues with file locks
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            temp_path = temp_file.name
-
-        # Write to the temporary file first
-        with open(temp_path, "wb") as output_file:
-            writer.write(output_file)
-
         # Create output directory if it doesn't exist
         output_dir = os.path.dirname(output_pdf_path)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        # Copy the temporary file to the final location
-        _copy_temp_to_output(temp_path, output_pdf_path)
+        # Write next to the output and rename atomically on completion, so
+        # the merged PDF is written exactly once and readers never see a
+        # half-written file
+        part_path = output_pdf_path + ".part"
+        with open(part_path, "wb") as output_file:
+            writer.write(output_file)
+        os.replace(part_path, output_pdf_path)
 
         logger.info(f"Successfully created merged PDF: {output_pdf_path}")
         return output_pdf_path
@@ -105,10 +159,171 @@ def merge_pdfs(original_pdf_path, overlay_pdf_path, output_pdf_path):
         raise
     except Exception as e:
         logger.error(f"Error merging PDFs: {str(e)}")
-        # Clean up temporary file if it exists
-        if "temp_path" in locals() and os.path.exists(temp_path):
+        # Clean up partial output file if it exists
+        if "part_path" in locals() and os.path.exists(part_path):
+            try:
+                os.remove(part_path)
+            except:
+                pass
+        raise
+
+
+def _merge_pdfs_pikepdf(original_pdf_path, overlay_pdf_path, output_pdf_path):
+    """
+    Merge original and overlay PDFs through pikepdf/QPDF
+
+    The per-page overlay runs in C++ instead of PyPDF2's pure-Python
+    content-stream merge, and save() writes the output atomically, so no
+    temp-file handling is needed.
+    """
+    with pikepdf.open(original_pdf_path) as original, pikepdf.open(
+        overlay_pdf_path
+    ) as overlay:
+        # Check page count mismatch
+        if len(original.pages) != len(overlay.pages):
+            logger.warning(
+                f"Page count mismatch: Original has {len(original.pages)} pages, "
+                f"overlay has {len(overlay.pages)} pages"
+            )
+
+        for i, page in enumerate(original.pages):
+            if i >= len(overlay.pages):
+                logger.warning(f"No overlay for page {i+1}, keeping original")
+                continue
+
+            # Skip overlay pages with no content
+            overlay_page = overlay.pages[i]
+            contents = overlay_page.obj.get("/Contents")
+            if contents is None or (
+                isinstance(contents, pikepdf.Stream)
+                and len(contents.read_raw_bytes()) == 0
+            ):
+                logger.debug("Overlay page %d is blank, keeping original", i + 1)
+                continue
+
+            logger.debug("Merging page %d", i + 1)
+            page.add_overlay(overlay_page)
+
+        # Create output directory if it doesn't exist
+        output_dir = os.path.dirname(output_pdf_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        original.save(
+            output_pdf_path,
+            linearize=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+
+    logger.info(f"Successfully created merged PDF: {output_pdf_path}")
+    return output_pdf_path
+
+
+def _merge_page_range(original_pdf_path, overlay_pdf_path, start, end):
+    """
+    Worker entry point for parallel merging: merge pages [start, end) of the
+    original PDF with the overlay and return the serialized result.
+
+    PDFs are reopened from their paths because reader objects are not
+    picklable; the returned bytes are, so results can cross process
+    boundaries.
+    """
+    original_reader = PdfReader(original_pdf_path)
+    overlay_reader = PdfReader(overlay_pdf_path)
+    writer = PdfWriter()
+
+    for i in range(start, end):
+        page = original_reader.pages[i]
+        if i < len(overlay_reader.pages):
+            page.merge_page(overlay_reader.pages[i])
+        writer.add_page(page)
+
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def merge_pdfs_parallel(
+    original_pdf_path, overlay_pdf_path, output_pdf_path, max_workers=None
+):
+    """
+    Merge an original PDF with an overlay PDF using multiple processes
+
+    merge_page is CPU-bound (content-stream and resource-dict merging in
+    pure Python), so large documents scale with cores: the page range is
+    split across workers, each returns a serialized partial PDF, and the
+    parts are concatenated in order.
+
+    Args:
+        original_pdf_path: Path to the original PDF file
+        overlay_pdf_path: Path to the overlay PDF with white masks and translations
+        output_pdf_path: Path where the merged PDF will be saved
+        max_workers: Number of worker processes (None for cpu_count)
+
+    Returns:
+        Path to the merged PDF file
+    """
+    try:
+        logger.info(
+            f"Merging original PDF ({original_pdf_path}) with overlay ({overlay_pdf_path}) in parallel"
+        )
+
+        # Check if input files exist
+        if not os.path.exists(original_pdf_path):
+            raise FileNotFoundError(f"Original PDF not found: {original_pdf_path}")
+        if not os.path.exists(overlay_pdf_path):
+            raise FileNotFoundError(f"Overlay PDF not found: {overlay_pdf_path}")
+
+        total_pages = len(_reader(original_pdf_path).pages)
+        num_workers = min(max_workers or os.cpu_count() or 1, total_pages)
+
+        if num_workers <= 1:
+            # Not enough pages to amortize worker startup
+            return merge_pdfs(original_pdf_path, overlay_pdf_path, output_pdf_path)
+
+        # Split the page range into one contiguous chunk per worker
+        chunk_size = -(-total_pages // num_workers)
+        ranges = [
+            (start, min(start + chunk_size, total_pages))
+            for start in range(0, total_pages, chunk_size)
+        ]
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            parts = list(
+                executor.map(
+                    _merge_page_range,
+                    [original_pdf_path] * len(ranges),
+                    [overlay_pdf_path] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                )
+            )
+
+        # Concatenate the partial PDFs in page order
+        writer = PdfWriter()
+        for part in parts:
+            writer.append(PdfReader(io.BytesIO(part)))
+
+        # Create output directory if it doesn't exist
+        output_dir = os.path.dirname(output_pdf_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        # Write next to the output and rename atomically on completion
+        part_path = output_pdf_path + ".part"
+        with open(part_path, "wb") as output_file:
+            writer.write(output_file)
+        os.replace(part_path, output_pdf_path)
+
+        logger.info(f"Successfully created merged PDF: {output_pdf_path}")
+        return output_pdf_path
+
+    except Exception as e:
+        logger.error(f"Error merging PDFs in parallel: {str(e)}")
+        # Clean up partial output file if it exists
+        if "part_path" in locals() and os.path.exists(part_path):
             try:
-                os.remove(temp_path)
+                os.remove(part_path)
             except:
                 pass
         raise
@@ -138,53 +353,61 @@ def merge_pdfs_in_batches(
         if not os.path.exists(overlay_pdf_path):
             raise FileNotFoundError(f"Overlay PDF not found: {overlay_pdf_path}")
 
+        # QPDF streams objects from the source files and flushes them on
+        # save, so it keeps memory bounded without manual batching
+        if pikepdf is not None:
+            return _merge_pdfs_pikepdf(
+                original_pdf_path, overlay_pdf_path, output_pdf_path
+            )
+
         # Open the PDF files
         original_reader = PdfReader(original_pdf_path)
-        overlay_reader = PdfReader(overlay_pdf_path)
+        overlay_reader = _reader(overlay_pdf_path)
         writer = PdfWriter()
 
-        # Process pages in batches
+        # Process overlaid pages in batches; pages past the end of the
+        # overlay form a contiguous tail that is appended in one call below
         total_pages = len(original_reader.pages)
-        for i in range(0, total_pages, batch_size):
-            end = min(i + batch_size, total_pages)
+        overlay_count = min(total_pages, len(overlay_reader.pages))
+        for i in range(0, overlay_count, batch_size):
+            end = min(i + batch_size, overlay_count)
             logger.info(f"Processing pages {i+1} to {end} (of {total_pages})")
 
             # Process each page in the current batch
             for j in range(i, end):
-                if j < len(overlay_reader.pages):
-                    # Create a new page by merging original and overlay
-                    page = original_reader.pages[j]
-                    page.merge_page(overlay_reader.pages[j])
-                    writer.add_page(page)
-                else:
-                    # Add original page without overlay
-                    writer.add_page(original_reader.pages[j])
-
-        # Use a temporary file to avoid issues with file locks
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            temp_path = temp_file.name
+                # Create a new page by merging original and overlay
+                page = original_reader.pages[j]
+                page.merge_page(overlay_reader.pages[j])
+                writer.add_page(page)
 
-        # Write to the temporary file first
-        with open(temp_path, "wb") as output_file:
-            writer.write(output_file)
+        # Add remaining original pages without overlay in a single batch
+        if overlay_count < total_pages:
+            writer.append(
+                original_reader, pages=list(range(overlay_count, total_pages))
+            )
 
         # Create output directory if it doesn't exist
         output_dir = os.path.dirname(output_pdf_path)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        # Copy the temporary file to the final location
-        _copy_temp_to_output(temp_path, output_pdf_path)
+        # Write next to the output and rename atomically on completion, so
+        # the merged PDF is written exactly once and readers never see a
+        # half-written file
+        part_path = output_pdf_path + ".part"
+        with open(part_path, "wb") as output_file:
+            writer.write(output_file)
+        os.replace(part_path, output_pdf_path)
 
         logger.info(f"Successfully created merged PDF: {output_pdf_path}")
         return output_pdf_path
 
     except Exception as e:
         logger.error(f"Error merging PDFs in batches: {str(e)}")
-        # Clean up temporary file if it exists
-        if "temp_path" in locals() and os.path.exists(temp_path):
+        # Clean up partial output file if it exists
+        if "part_path" in locals() and os.path.exists(part_path):
             try:
-                os.remove(temp_path)
+                os.remove(part_path)
             except:
                 pass
         raise
@@ -216,41 +439,48 @@ def merge_selected_pages(
 
         # Open the PDF files
         original_reader = PdfReader(original_pdf_path)
-        overlay_reader = PdfReader(overlay_pdf_path)
+        overlay_reader = _reader(overlay_pdf_path)
         writer = PdfWriter()
 
         # Use all pages if no specific indices are provided
         if page_indices is None:
             page_indices = range(len(original_reader.pages))
 
-        # Add selected pages
+        # Add selected pages; contiguous runs of pages without an overlay
+        # are appended in one batch instead of page-by-page
+        overlay_count = len(overlay_reader.pages)
+        passthrough_run = []
+
+        def _flush_passthrough():
+            if passthrough_run:
+                writer.append(original_reader, pages=list(passthrough_run))
+                passthrough_run.clear()
+
         for i in page_indices:
             if i < len(original_reader.pages):
-                page = original_reader.pages[i]
-
-                # Merge with overlay if available
-                if i < len(overlay_reader.pages):
+                if i < overlay_count:
+                    _flush_passthrough()
+                    page = original_reader.pages[i]
                     page.merge_page(overlay_reader.pages[i])
-
-                writer.add_page(page)
+                    writer.add_page(page)
+                else:
+                    passthrough_run.append(i)
             else:
                 logger.warning(f"Page index {i} is out of range")
-
-        # Use a temporary file to avoid issues with file locks
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            temp_path = temp_file.name
-
-        # Write to the temporary file first
-        with open(temp_path, "wb") as output_file:
-            writer.write(output_file)
+        _flush_passthrough()
 
         # Create output directory if it doesn't exist
         output_dir = os.path.dirname(output_pdf_path)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        # Copy the temporary file to the final location
-        _copy_temp_to_output(temp_path, output_pdf_path)
+        # Write next to the output and rename atomically on completion, so
+        # the merged PDF is written exactly once and readers never see a
+        # half-written file
+        part_path = output_pdf_path + ".part"
+        with open(part_path, "wb") as output_file:
+            writer.write(output_file)
+        os.replace(part_path, output_pdf_path)
 
         logger.info(
             f"Successfully created merged PDF with {len(page_indices)} pages: {output_pdf_path}"
@@ -259,10 +489,10 @@ def merge_selected_pages(
 
     except Exception as e:
         logger.error(f"Error merging selected PDF pages: {str(e)}")
-        # Clean up temporary file if it exists
-        if "temp_path" in locals() and os.path.exists(temp_path):
+        # Clean up partial output file if it exists
+        if "part_path" in locals() and os.path.exists(part_path):
             try:
-                os.remove(temp_path)
+                os.remove(part_path)
             except:
                 pass
         raise
@@ -280,7 +510,7 @@ def verify_pdf_integrity(pdf_path):
     """
     try:
         # Try to open and read basic info
-        reader = PdfReader(pdf_path)
+        reader = _reader(pdf_path)
         page_count = len(reader.pages)
         metadata = reader.metadata
 
@@ -303,17 +533,20 @@ def get_pdf_info(pdf_path):
         Dictionary with PDF information or None if invalid
     """
     try:
-        if not os.path.exists(pdf_path):
+        # One stat covers both the existence check and the size fields
+        try:
+            file_stat = os.stat(pdf_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
-        reader = PdfReader(pdf_path)
+        reader = _reader(pdf_path)
 
         info = {
             "path": pdf_path,
             "filename": os.path.basename(pdf_path),
             "page_count": len(reader.pages),
-            "file_size_bytes": os.path.getsize(pdf_path),
-            "file_size_mb": os.path.getsize(pdf_path) / (1024 * 1024),
+            "file_size_bytes": file_stat.st_size,
+            "file_size_mb": file_stat.st_size / (1024 * 1024),
         }
 
         # Try to get metadata (might not be available in all PDFs)
@@ -342,6 +575,11 @@ def get_pdf_info(pdf_path):
 if __name__ == "__main__":
     import argparse
 
+    # Configure logging only when run as a script, not on import
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
     # Parse command line arguments
     parser = argparse.ArgumentParser(
         description="Merge original PDF with overlay translation"
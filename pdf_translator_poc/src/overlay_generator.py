@@ -1,14 +1,34 @@
 # overlay_generator.py
 # Module for PDF overlay creation
 
+import concurrent.futures
+import copy
 import os
 import logging
+import re
+import shutil
+import tempfile
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from reportlab import rl_config
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.utils import simpleSplit
 from reportlab.lib.colors import Color
 
+# orjson parses large extraction JSON much faster; fall back to stdlib json
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
+import json
+
+# Skip ReportLab's per-call shape/attribute validation on the hot drawing
+# path; set OVERLAY_DEBUG=1 in the environment to turn it back on
+if not os.environ.get("OVERLAY_DEBUG"):
+    rl_config.shapeChecking = 0
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -25,15 +45,93 @@ except ImportError:
         logger.warning("Google Fonts integration not available")
         get_or_download_font = None
 
-# Register fallback fonts for Latin and Japanese text
-try:
-    pdfmetrics.registerFont(TTFont("NotoSans", "fonts/Noto_Sans/static/NotoSans-Regular.ttf"))
-    pdfmetrics.registerFont(TTFont("NotoSerif", "fonts/Noto_Serif/static/NotoSerif-Regular.ttf"))
-    pdfmetrics.registerFont(TTFont("NotoSansJP", "fonts/Noto_Sans_JP/static/NotoSansJP-Regular.ttf"))
-    pdfmetrics.registerFont(TTFont("NotoSerifJP", "fonts/Noto_Serif_JP/static/NotoSerifJP-Regular.ttf"))
-    logger.info("Registered default Noto fonts")
-except Exception as e:
-    logger.warning(f"Could not register default Noto fonts: {e}")
+# Default cache directory for downloaded fonts, computed once at import;
+# created lazily on first use so importing never touches the filesystem
+_DEFAULT_FONT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fonts_cache"
+)
+_default_font_dir_ready = False
+
+
+def _ensure_default_font_dir():
+    """Create _DEFAULT_FONT_DIR on first use, skipping the syscall after."""
+    global _default_font_dir_ready
+    if not _default_font_dir_ready:
+        os.makedirs(_DEFAULT_FONT_DIR, exist_ok=True)
+        _default_font_dir_ready = True
+    return _DEFAULT_FONT_DIR
+
+
+# Fonts registered with ReportLab, mirrored as a set because
+# pdfmetrics.getRegisteredFontNames() builds a fresh list on every call
+_REGISTERED = set(pdfmetrics.getRegisteredFontNames())
+
+# ReportLab's built-in Type 1 fonts, usable without registration
+_STANDARD14 = frozenset({
+    "Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique",
+    "Times-Roman", "Times-Bold", "Times-Italic", "Times-BoldItalic",
+    "Courier", "Courier-Bold", "Courier-Oblique", "Courier-BoldOblique",
+    "Symbol", "ZapfDingbats",
+})
+
+
+# Parsed TTFont instances keyed by real font path; parsing the OpenType
+# tables is the hot part of registration, so aliases reuse the parsed face
+_TTFONT_CACHE = {}
+
+
+def _get_ttfont(name, path):
+    """
+    Build a TTFont for name/path, reusing parsed font tables when the same
+    file was opened before under any alias.
+    """
+    key = os.path.realpath(path)
+    cached = _TTFONT_CACHE.get(key)
+    if cached is None:
+        cached = _TTFONT_CACHE[key] = TTFont(name, path)
+    if cached.fontName == name:
+        return cached
+    # New alias for an already-parsed file: share the face, fresh per-name
+    # document state
+    alias = copy.copy(cached)
+    alias.fontName = name
+    alias.state = {}
+    return alias
+
+
+def _register(name, path):
+    """
+    Register a TTF with ReportLab and mirror it in _REGISTERED.
+
+    Idempotent: a name that is already registered is skipped so repeated
+    overlay runs in one process never redo pdfmetrics.registerFont work.
+    """
+    if name in _REGISTERED:
+        return
+    pdfmetrics.registerFont(_get_ttfont(name, path))
+    _REGISTERED.add(name)
+
+
+# Fallback fonts for Latin and Japanese text are registered lazily on first
+# use so that importing this module stays cheap (parsing four Noto TTF files
+# dominates import time otherwise).
+_default_fonts_registered = False
+
+
+def _ensure_default_fonts():
+    """Register the bundled Noto fallback fonts on first font resolution."""
+    global _default_fonts_registered
+    if _default_fonts_registered:
+        return
+    _default_fonts_registered = True
+    try:
+        _register("NotoSans", "fonts/Noto_Sans/static/NotoSans-Regular.ttf")
+        _register("NotoSerif", "fonts/Noto_Serif/static/NotoSerif-Regular.ttf")
+        _register("NotoSansJP", "fonts/Noto_Sans_JP/static/NotoSansJP-Regular.ttf")
+        _register("NotoSerifJP", "fonts/Noto_Serif_JP/static/NotoSerifJP-Regular.ttf")
+        logger.info("Registered default Noto fonts")
+    except Exception as e:
+        logger.warning(f"Could not register default Noto fonts: {e}")
 
 # Font configurations - Special case fonts for specific languages
 FONT_CONFIG = {
@@ -48,6 +146,11 @@ AVAILABLE_FONTS = {"default": True}
 # Dynamic font registry for downloaded Google Fonts
 GOOGLE_FONTS_REGISTRY = {}
 
+# Negative cache of (original_font, target_language) pairs whose Google
+# Fonts download failed; failures are remembered so they don't trigger a
+# fresh network attempt for every paragraph (or after cache clears)
+_FONT_DOWNLOAD_FAILED = set()
+
 # Font family mapping - maps common font families to available fonts
 FONT_FAMILY_MAPPING = {
     # Sans-serif fonts
@@ -116,14 +219,42 @@ FONT_STYLE_MAPPING = {
     }
 }
 
+# Deletes spaces, dashes, underscores and commas from font names in one
+# C-level pass
+_FONT_NAME_STRIP = str.maketrans("", "", " -_,")
+
+# Mapping from normalized base font names to ReportLab standard fonts
+STANDARD_FONT_MAP = {
+    "times": "Times-Roman",
+    "timesnewroman": "Times-Roman",
+    "times new roman": "Times-Roman",
+    "times-roman": "Times-Roman",
+    "helvetica": "Helvetica",
+    "arial": "Helvetica",
+    "courier": "Courier",
+    "symbol": "Symbol",
+}
 
+
+# Style scanners for parse_font_name, compiled once: each replaces a loop
+# of Python-level substring probes with a single C-level regex pass
+_BOLDITALIC_RE = re.compile(r"bolditalic|boldobl|heavyitalic|blackitalic")
+_BOLD_RE = re.compile(r"extrabold|semibold|demibold|bold|heavy|black")
+_ITALIC_RE = re.compile(r"italic|oblique|slant")
+_STYLE_SUFFIXES = ("regular", "normal", "roman", "book", "medium", "light", "thin", "mt")
+
+
+@lru_cache(maxsize=1024)
 def parse_font_name(font_name):
     """
     Parse a font name to extract family and style information.
-    
+
+    Memoized: documents reuse the same few dozen font names across
+    thousands of paragraphs, so repeat calls are a dict lookup.
+
     Args:
         font_name: Font name from PDF (e.g., "IJCIDQ+Gotham-Book", "Gotham-Italic", "Times-Bold")
-    
+
     Returns:
         tuple: (family, style) where family is the font family and style is the font style
     """
@@ -151,50 +282,37 @@ def parse_font_name(font_name):
             style = "regular"
         
         # Clean and normalize the base font name
-        family = base_font.lower().replace(" ", "").replace("-", "").replace("_", "")
-        
+        family = base_font.lower().translate(_FONT_NAME_STRIP)
+
     else:
         # Original parsing logic for dash-separated styles
         font_name_lower = font_name.lower()
         style = "regular"
         family = font_name_lower
         
-        # Check for style indicators in font name
-        style_indicators = {
-            "bold": ["bold", "heavy", "black", "extrabold", "semibold", "demibold"],
-            "italic": ["italic", "oblique", "slant"],
-            "bolditalic": ["bolditalic", "boldobl", "heavyitalic", "blackitalic"]
-        }
-        
-        # First check for bold+italic combinations
-        for style_name, indicators in style_indicators.items():
-            for indicator in indicators:
-                if indicator in font_name_lower:
-                    if style_name == "bolditalic":
-                        style = "bolditalic"
-                        family = font_name_lower.replace(indicator, "").strip("-_ ")
-                        break
-        
-        # If not bold+italic, check for individual styles
-        if style == "regular":
-            for style_name, indicators in style_indicators.items():
-                if style_name == "bolditalic":
-                    continue
-                for indicator in indicators:
-                    if indicator in font_name_lower:
-                        style = style_name
-                        family = font_name_lower.replace(indicator, "").strip("-_ ")
-                        break
-                if style != "regular":
-                    break
-        
+        # Check for style indicators: bold+italic combinations first, then
+        # individual styles, stripping the matched indicator from the family
+        match = _BOLDITALIC_RE.search(font_name_lower)
+        if match:
+            style = "bolditalic"
+        else:
+            match = _BOLD_RE.search(font_name_lower)
+            if match:
+                style = "bold"
+            else:
+                match = _ITALIC_RE.search(font_name_lower)
+                if match:
+                    style = "italic"
+        if match:
+            family = font_name_lower.replace(match.group(0), "").strip("-_ ")
+
+
         # Clean up family name - remove common suffixes/prefixes and punctuation
-        family = family.replace("-", "").replace("_", "").replace(" ", "").strip()
-        
+        family = family.translate(_FONT_NAME_STRIP)
+
         # Remove common style suffixes that might remain (but be careful with "Times New Roman")
         if family != "timesnewroman":  # Don't strip "roman" from "Times New Roman"
-            style_suffixes = ["regular", "normal", "roman", "book", "medium", "light", "thin", "mt"]
-            for suffix in style_suffixes:
+            for suffix in _STYLE_SUFFIXES:
                 if family.endswith(suffix):
                     family = family[:-len(suffix)].strip()
                     break
@@ -203,10 +321,21 @@ def parse_font_name(font_name):
     if not family:
         family = "helvetica"
     
-    logger.debug(f"Parsed font '{font_name}' -> family: '{family}', style: '{style}'")
+    logger.debug("Parsed font '%s' -> family: '%s', style: '%s'", font_name, family, style)
     return family, style
 
 
+@lru_cache(maxsize=256)
+def _font_path_exists(path):
+    """
+    os.path.exists memoized for font files, which are static during a run.
+
+    Distinct (family, style, language) keys can resolve to the same Noto
+    file, so this keeps the stat volume at one syscall per unique path.
+    """
+    return os.path.exists(path)
+
+
 def get_mapped_font_path(font_family, font_style, target_language="vi"):
     """
     Get the appropriate font path based on font family, style, and target language.
@@ -241,14 +370,14 @@ def get_mapped_font_path(font_family, font_style, target_language="vi"):
         font_path = available_styles.get("regular")
         font_style = "regular"  # Update font_style to match what we're actually using
     
-    if font_path and os.path.exists(font_path):
+    if font_path and _font_path_exists(font_path):
         # Generate a unique font name for ReportLab registration
         font_name = f"Mapped_{font_category}_{font_style}_{target_language}"
         
         # Register the font with ReportLab if not already registered
-        if font_name not in pdfmetrics.getRegisteredFontNames():
+        if font_name not in _REGISTERED:
             try:
-                pdfmetrics.registerFont(TTFont(font_name, font_path))
+                _register(font_name, font_path)
                 logger.info(f"FONT REGISTERED: {font_name} from {font_path}")
             except Exception as e:
                 logger.warning(f"Failed to register font {font_name}: {e}")
@@ -260,6 +389,139 @@ def get_mapped_font_path(font_family, font_style, target_language="vi"):
 
 
 # Function to create white masks over original text
+# Shared Color objects for mask drawing; reportlab Colors are immutable,
+# so one instance can serve every mask instead of allocating per call
+_MASK_WHITE = Color(1, 1, 1, alpha=1)
+_MASK_OUTLINE_RED = Color(1, 0, 0, alpha=1)
+
+
+def _open_pdf_output(output_path):
+    """Open a PDF output file with a wide write buffer (1MB chunks)."""
+    return open(output_path, "wb", buffering=1 << 20)
+
+
+def _fast_rects(c, rects, op="B"):
+    """
+    Append rectangles to the page content stream as one raw PDF path.
+
+    Skips ReportLab's path-object machinery for the debug hot loop and
+    paints all (x, y, width, height) rects with a single operator, so a
+    page of boxes costs one path emit instead of one per box. The caller
+    must have already set fill/stroke state. op is the paint operator:
+    "B" fills and strokes, "f" fills only.
+    """
+    if rects:
+        c._code.append(
+            " ".join("%.2f %.2f %.2f %.2f re" % rect for rect in rects) + " " + op
+        )
+
+
+def _group_by_page(paragraphs):
+    """Group paragraphs into a page_number -> list dict in one pass."""
+    pages = defaultdict(list)
+    for para in paragraphs:
+        pages[para.get("page_number", 1)].append(para)
+    return pages
+
+
+# Padding applied around every mask, shared by all mask-collection passes
+_MASK_PADDING = 2
+
+# Minimum merged masks on a page before the Form XObject pays for itself
+_MASK_FORM_THRESHOLD = 10
+
+
+def _draw_masks_via_form(c, rects):
+    """
+    Draw white masks by invoking a shared unit-square Form XObject per
+    rectangle.
+
+    The rectangle is defined once per document; each mask then costs one
+    translate/scale/Do instead of a full rect specification, which shrinks
+    the content stream on mask-heavy pages (table grids and the like).
+    """
+    if not getattr(c, "_wmask_defined", False):
+        c.beginForm("wmask", lowerx=0, lowery=0, upperx=1, uppery=1)
+        c.setFillColor(_MASK_WHITE)
+        c.rect(0, 0, 1, 1, fill=1, stroke=0)
+        c.endForm()
+        c._wmask_defined = True
+    for x0, y0, x1, y1 in rects:
+        c.saveState()
+        c.translate(x0, y0)
+        c.scale(x1 - x0, y1 - y0)
+        c.doForm("wmask")
+        c.restoreState()
+
+
+def _draw_merged_masks(c, mask_rects, debug_outline=False):
+    """
+    Merge collected (x0, y0, x1, y1) mask bounds and draw them, routing
+    mask-heavy pages through the shared 'wmask' Form XObject.
+
+    Outlined masks keep the plain rect path: stamping a unit square under a
+    non-uniform scale would distort the outline stroke width.
+    """
+    merged_rects = _merge_mask_rects(mask_rects)
+    if len(merged_rects) > _MASK_FORM_THRESHOLD and not debug_outline:
+        _draw_masks_via_form(c, merged_rects)
+    else:
+        for mx0, my0, mx1, my1 in merged_rects:
+            create_white_mask(
+                c,
+                mx0,
+                my0,
+                mx1 - mx0,
+                my1 - my0,
+                padding=0,
+                debug_outline=debug_outline,
+            )
+
+
+def _intersects_any(x0, y0, x1, y1, boxes):
+    """
+    True if the (x0, y0, x1, y1) rectangle overlaps any box in boxes.
+
+    A linear scan is plenty here: pages carry at most a few hundred source
+    boxes and the scan short-circuits on the first hit.
+    """
+    for bx0, by0, bx1, by1 in boxes:
+        if x0 < bx1 and bx0 < x1 and y0 < by1 and by0 < y1:
+            return True
+    return False
+
+
+def _merge_mask_rects(rects):
+    """
+    Merge overlapping or touching (x0, y0, x1, y1) rectangles into their
+    bounding-box unions.
+
+    Adjacent paragraphs (lines in a column) produce masks whose 2px padding
+    overlaps, so text-heavy pages collapse from N rectangles down to a few
+    merged regions, shrinking the emitted content stream.
+    """
+    rects = sorted(rects, key=lambda r: (r[1], r[0]))
+    changed = True
+    while changed:
+        changed = False
+        merged = []
+        for x0, y0, x1, y1 in rects:
+            for i, (mx0, my0, mx1, my1) in enumerate(merged):
+                if x0 <= mx1 and mx0 <= x1 and y0 <= my1 and my0 <= y1:
+                    merged[i] = (
+                        min(x0, mx0),
+                        min(y0, my0),
+                        max(x1, mx1),
+                        max(y1, my1),
+                    )
+                    changed = True
+                    break
+            else:
+                merged.append((x0, y0, x1, y1))
+        rects = merged
+    return rects
+
+
 def create_white_mask(c, x, y, width, height, padding=2, debug_outline=False):
     """
     Create an opaque white rectangle over original text with padding
@@ -271,7 +533,10 @@ def create_white_mask(c, x, y, width, height, padding=2, debug_outline=False):
         padding: Extra padding in pixels to ensure complete coverage
         debug_outline: If True, draw red outline around the white mask
     """
-    c.setFillColor(Color(1, 1, 1, alpha=1))  # Solid white
+    # Solid white; consecutive masks share fill state, so only emit the
+    # operator when the canvas isn't already filling with our white
+    if c._fillColorObj is not _MASK_WHITE:
+        c.setFillColor(_MASK_WHITE)
 
     # Expand mask by padding pixels in all directions
     x = x - padding
@@ -281,7 +546,7 @@ def create_white_mask(c, x, y, width, height, padding=2, debug_outline=False):
 
     if debug_outline:
         # Draw white mask with red outline for debugging
-        c.setStrokeColor(Color(1, 0, 0, alpha=1))  # Red outline
+        c.setStrokeColor(_MASK_OUTLINE_RED)  # Red outline
         c.setLineWidth(0.5)  # Slim line
         c.rect(x, y, width, height, fill=1, stroke=1)
     else:
@@ -289,11 +554,17 @@ def create_white_mask(c, x, y, width, height, padding=2, debug_outline=False):
         c.rect(x, y, width, height, fill=1, stroke=0)
 
 
+@lru_cache(maxsize=256)
 def get_font_for_target_language(target_language, original_font):
     """
     Choose the appropriate font based on target language and original font.
     This function prioritizes using the extracted font_name from the PDF to find a matching Google Font.
 
+    Results are memoized per (target_language, original_font) — documents
+    repeat the same few fonts across hundreds of paragraphs, so resolution
+    (including any download attempt) runs once per unique pair. Call
+    _font_resolution_cache_clear() after registering new fonts.
+
     Args:
         target_language: Target language code (e.g., 'vi', 'en', 'ja')
         original_font: Font name from original PDF
@@ -303,33 +574,51 @@ def get_font_for_target_language(target_language, original_font):
     """
     global AVAILABLE_FONTS, GOOGLE_FONTS_REGISTRY
 
+    _ensure_default_fonts()
+
     logger.debug(
-        f"Font selection - Original: '{original_font}', Target language: '{target_language}'"
+        "Font selection - Original: '%s', Target language: '%s'",
+        original_font,
+        target_language,
     )
 
-    # Always try to use Google Fonts first to match the extracted font_name
-    if get_or_download_font and original_font:
+    # Always try to use Google Fonts first to match the extracted font_name,
+    # unless a previous download attempt for this pair already failed
+    if (
+        get_or_download_font
+        and original_font
+        and (original_font, target_language) not in _FONT_DOWNLOAD_FAILED
+    ):
         try:
-            # Create font cache directory if needed
-            font_dir = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), "fonts_cache"
-            )
-            os.makedirs(font_dir, exist_ok=True)
+            # Font cache directory, created on first use
+            font_dir = _ensure_default_font_dir()
 
             # Generate a clean font name for registration
-            clean_name = (
-                original_font.lower().replace(" ", "").replace("-", "").replace(",", "")
-            )
+            clean_name = original_font.lower().translate(_FONT_NAME_STRIP)
             registered_name = f"{clean_name.capitalize()}{target_language.upper()}"
 
             # Check if already registered
             if registered_name in GOOGLE_FONTS_REGISTRY:
-                logger.debug(f"Using previously downloaded font: {registered_name}")
+                logger.debug("Using previously downloaded font: %s", registered_name)
+                return registered_name
+
+            # Prefer a bundled, pre-subsetted TTF over any network download.
+            # Subsets are produced at build time with pyftsubset (e.g.
+            # --unicodes=U+0000-024F,U+1E00-1EFF for Latin + Vietnamese) and
+            # shipped in the font cache dir as <cleanname>.subset.ttf
+            subset_path = os.path.join(font_dir, f"{clean_name}.subset.ttf")
+            if _font_path_exists(subset_path):
+                if registered_name not in _REGISTERED:
+                    _register(registered_name, subset_path)
+                GOOGLE_FONTS_REGISTRY[registered_name] = subset_path
+                logger.debug("Using bundled subset font: %s", subset_path)
                 return registered_name
 
             # Try to get a matching font from Google Fonts with support for the target language
             logger.debug(
-                f"Attempting to fetch font similar to '{original_font}' from Google Fonts for {target_language}"
+                "Attempting to fetch font similar to '%s' from Google Fonts for %s",
+                original_font,
+                target_language,
             )
             font_path, font_family_name = get_or_download_font(
                 original_font, "regular", font_dir, target_language
@@ -338,14 +627,12 @@ def get_font_for_target_language(target_language, original_font):
             if font_path and os.path.exists(font_path):
                 # Create a more descriptive registered name that includes style information
                 # Use the original font name to preserve style info for ReportLab registration
-                clean_original = (
-                    original_font.replace(" ", "").replace(",", "").replace("-", "")
-                )
+                clean_original = original_font.translate(_FONT_NAME_STRIP)
                 registered_name = f"{clean_original}_{target_language.upper()}"
 
                 # Register the font if not already registered
-                if registered_name not in pdfmetrics.getRegisteredFontNames():
-                    pdfmetrics.registerFont(TTFont(registered_name, font_path))
+                if registered_name not in _REGISTERED:
+                    _register(registered_name, font_path)
                     GOOGLE_FONTS_REGISTRY[registered_name] = font_path
 
                     # Store in available fonts for future reference with original font name as key
@@ -378,16 +665,18 @@ def get_font_for_target_language(target_language, original_font):
                 return registered_name
             else:
                 logger.debug(
-                    f"Could not download font '{original_font}' from Google Fonts"
+                    "Could not download font '%s' from Google Fonts", original_font
                 )
+                _FONT_DOWNLOAD_FAILED.add((original_font, target_language))
         except Exception as e:
             logger.error(f"Failed to dynamically fetch font '{original_font}': {e}")
+            _FONT_DOWNLOAD_FAILED.add((original_font, target_language))
 
     # Fallback to language-specific special handling
 
     # Use special font for Japanese if Google Fonts failed
     if target_language == "ja" and "ja" in AVAILABLE_FONTS:
-        logger.debug(f"Using Japanese-specific font: {FONT_CONFIG['ja']}")
+        logger.debug("Using Japanese-specific font: %s", FONT_CONFIG["ja"])
         return FONT_CONFIG["ja"]
 
     # For Vietnamese, try existing Vietnamese fonts if Google Fonts failed
@@ -395,7 +684,7 @@ def get_font_for_target_language(target_language, original_font):
         # Check if we have a Times-compatible Vietnamese font (highest priority)
         if "times_vi" in AVAILABLE_FONTS:
             vi_font = AVAILABLE_FONTS["times_vi"]
-            logger.debug(f"Using Times-like Vietnamese font: {vi_font}")
+            logger.debug("Using Times-like Vietnamese font: %s", vi_font)
             return vi_font
 
         # Check if Times-Roman is specially registered with Vietnamese support
@@ -406,15 +695,16 @@ def get_font_for_target_language(target_language, original_font):
         # Fall back to any Vietnamese font
         if "vi" in AVAILABLE_FONTS:
             vi_font = AVAILABLE_FONTS["vi"]
-            logger.debug(f"Using available Vietnamese font: {vi_font}")
+            logger.debug("Using available Vietnamese font: %s", vi_font)
             return vi_font
 
     # Finally fall back to mapped standard font
     mapped_font = map_to_standard_font(original_font)
-    logger.debug(f"Using standard mapped font: {mapped_font} (from {original_font})")
+    logger.debug("Using standard mapped font: %s (from %s)", mapped_font, original_font)
     return mapped_font
 
 
+@lru_cache(maxsize=256)
 def map_to_standard_font(original_font):
     """
     Map original PDF font name to a standard font available in ReportLab
@@ -436,7 +726,9 @@ def map_to_standard_font(original_font):
     base_font_no_spaces = base_font.replace(" ", "")
 
     logger.debug(
-        f"Font mapping - Base font: '{base_font}', No spaces: '{base_font_no_spaces}'"
+        "Font mapping - Base font: '%s', No spaces: '%s'",
+        base_font,
+        base_font_no_spaces,
     )
 
     # Check for NotoSans availability for Vietnamese text
@@ -444,28 +736,16 @@ def map_to_standard_font(original_font):
         logger.debug("NotoSans-Regular is available for better Vietnamese support")
         return "NotoSans-Regular"
 
-    # Common font mappings
-    font_map = {
-        "times": "Times-Roman",
-        "timesnewroman": "Times-Roman",
-        "times new roman": "Times-Roman",
-        "times-roman": "Times-Roman",
-        "helvetica": "Helvetica",
-        "arial": "Helvetica",
-        "courier": "Courier",
-        "symbol": "Symbol",
-    }
-
     # Check if it's a bold or italic variant
     is_bold = "bold" in original_font.lower()
     is_italic = any(x in original_font.lower() for x in ["italic", "oblique"])
 
     # Try to find a match with or without spaces
-    base = font_map.get(base_font, None)
+    base = STANDARD_FONT_MAP.get(base_font, None)
     if base is None:
-        base = font_map.get(base_font_no_spaces, "Helvetica")
+        base = STANDARD_FONT_MAP.get(base_font_no_spaces, "Helvetica")
 
-    logger.debug(f"Mapped base: '{base_font}' -> '{base}'")
+    logger.debug("Mapped base: '%s' -> '%s'", base_font, base)
 
     # Return mapped font with appropriate style
     result = base
@@ -476,7 +756,7 @@ def map_to_standard_font(original_font):
     elif is_italic:
         result = base + "-Oblique"
 
-    logger.debug(f"Final font with style: '{result}'")
+    logger.debug("Final font with style: '%s'", result)
     return result
 
 
@@ -485,6 +765,9 @@ def get_appropriate_font(paragraph, target_language="vi"):
     Determine appropriate font based on target language and paragraph data.
     Maps fonts with proper style preservation: sans fonts -> NotoSans (with style), serif fonts -> NotoSerif (with style).
 
+    Resolution is memoized per (font_name, target_language) — generate_overlay
+    calls this for every paragraph, and a page repeats the same few fonts.
+
     Args:
         paragraph: The paragraph data containing font information
         target_language: Target language code (e.g., 'vi', 'en', 'ja')
@@ -492,22 +775,32 @@ def get_appropriate_font(paragraph, target_language="vi"):
     Returns:
         Font name to use for this text
     """
+    _ensure_default_fonts()
+
     # Get original font from paragraph (this is the fontname extracted from the PDF)
     original_font = paragraph.get("font_name", "Helvetica")
 
+    return _resolve_appropriate_font(original_font, target_language)
+
+
+@lru_cache(maxsize=256)
+def _resolve_appropriate_font(original_font, target_language):
+    """Resolve an extracted PDF font name to a registered overlay font."""
     logger.debug(
-        f"Font selection - Original font: '{original_font}', Target language: {target_language}"
+        "Font selection - Original font: '%s', Target language: %s",
+        original_font,
+        target_language,
     )
 
     # Parse the original font name to extract family and style
     font_family, font_style = parse_font_name(original_font)
-    logger.info(f"FONT PARSING: '{original_font}' -> family: '{font_family}', style: '{font_style}'")
+    logger.debug("FONT PARSING: '%s' -> family: '%s', style: '%s'", original_font, font_family, font_style)
 
     # Use the proper font mapping function that handles styles
     font_path, font_name = get_mapped_font_path(font_family, font_style, target_language)
     
     if font_name:
-        logger.info(f"FONT SELECTED: {font_name} (path: {font_path})")
+        logger.debug("FONT SELECTED: %s (path: %s)", font_name, font_path)
         return font_name
     else:
         # Fallback to basic font without style if styled version not found
@@ -530,14 +823,75 @@ def get_fallback_font(target_language="vi"):
     return "NotoSans"
 
 
-def register_fonts(font_dir=None):
+def _font_resolution_cache_clear():
+    """
+    Drop memoized font resolutions.
+
+    Both cached resolvers consult the mutable font registries, so any code
+    that registers fonts or mutates AVAILABLE_FONTS/GOOGLE_FONTS_REGISTRY
+    outside those functions should clear the caches afterwards.
+    """
+    get_font_for_target_language.cache_clear()
+    map_to_standard_font.cache_clear()
+    _resolve_appropriate_font.cache_clear()
+
+
+# Font dirs already registered this process; registration is one-shot
+_FONTS_REGISTERED_FOR = set()
+
+
+def register_fonts(font_dir=None, target_language="vi"):
     """
     Register additional fonts with ReportLab (simplified - no Google Fonts download)
 
+    Registration is idempotent and one-shot per (font_dir, target_language):
+    generate_overlay calls this for every document, and repeat calls must
+    not re-register fonts or flush the font-resolution caches.
+
     Args:
         font_dir: Directory containing font files. If None, uses default locations.
+        target_language: Target language code (e.g., 'vi', 'en', 'ja')
     """
+    key = (font_dir, target_language)
+    if key in _FONTS_REGISTERED_FOR:
+        return
+    _FONTS_REGISTERED_FOR.add(key)
+    _ensure_default_fonts()
     logger.info("Using local Noto fonts only - no Google Fonts download")
+    _font_resolution_cache_clear()
+
+
+def _validate_font(font):
+    """
+    Return font if ReportLab can use it, else Helvetica.
+
+    One set-membership check against the registered-font mirror and the
+    built-in Type 1 names replaces the old per-paragraph try/except around
+    c.setFont.
+    """
+    if font in _REGISTERED or font in _STANDARD14:
+        return font
+    logger.warning(f"Font '{font}' not available, falling back to Helvetica")
+    return "Helvetica"
+
+
+def _text_rgb(color):
+    """Normalize extracted color data to an (r, g, b) tuple (default black)."""
+    if color:
+        if isinstance(color[0], list):
+            # RGB color components
+            return (color[0][0], color[0][1], color[0][2])
+        # Grayscale
+        return (color[0], color[0], color[0])
+    return (0, 0, 0)
+
+
+def _canvas_fill_rgb(c):
+    """Current canvas fill color as an (r, g, b) tuple."""
+    current = c._fillColorObj
+    if isinstance(current, tuple):
+        return current[:3]
+    return (current.red, current.green, current.blue)
 
 
 def draw_fitted_text(
@@ -551,63 +905,41 @@ def draw_fitted_text(
         paragraph: Original paragraph data
         fitted_lines: List of lines from text fitting
         x, y: Base position coordinates
-        font_name: Font to use (ignored, will be determined by target language)
+        font_name: Resolved font to use (falls back to resolving from the
+            paragraph when not provided)
         font_size: Font size to use
         color: Text color
         target_language: Target language code (e.g., 'vi', 'en', 'ja')
     """
-    try:
-        # Get appropriate font for the target language
-        font = get_appropriate_font(paragraph, target_language)
-
-        # Log font selection for debugging
-        logger.debug(
-            f"Original font: {paragraph.get('font_name', 'Unknown')}, Selected font: {font}"
-        )
+    # Use the font resolved and validated by the caller; generate_overlay
+    # sorts paragraphs so consecutive calls usually share font state.
+    # Errors propagate — the overlay entry points already catch and log.
+    font = _validate_font(font_name or get_appropriate_font(paragraph, target_language))
 
-        # Reduce font size by 10%
-        adjusted_font_size = font_size * 0.9
-        
-        # Set the font
-        try:
-            c.setFont(font, adjusted_font_size)
-            logger.debug(f"Using font: {font} with adjusted size: {adjusted_font_size:.1f} (original: {font_size:.1f})")
-        except Exception as e:
-            # If font setting fails, fall back to Helvetica
-            logger.warning(
-                f"Font '{font}' not available ({str(e)}), falling back to Helvetica"
-            )
-            c.setFont("Helvetica", adjusted_font_size)
+    # Reduce font size by 10%
+    adjusted_font_size = font_size * 0.9
 
-        # Set color (default to black if not provided)
-        if color:
-            if isinstance(color[0], list):
-                # If we have RGB color components
-                c.setFillColorRGB(color[0][0], color[0][1], color[0][2])
-            else:
-                # If we have grayscale
-                c.setFillColorRGB(color[0], color[0], color[0])
-        else:
-            c.setFillColorRGB(0, 0, 0)  # Default black
+    # Set the font, skipping the call when the canvas already carries
+    # the right state (avoids redundant PDF state operators)
+    if c._fontname != font or c._fontsize != adjusted_font_size:
+        c.setFont(font, adjusted_font_size)
 
-        # Calculate line height using adjusted font size
-        line_height = adjusted_font_size * 1.2  # Add some leading
+    # Set color (default to black if not provided), again only on change
+    rgb = _text_rgb(color)
+    if _canvas_fill_rgb(c) != rgb:
+        c.setFillColorRGB(*rgb)
 
-        # Draw each line
-        for i, line in enumerate(fitted_lines):
-            # Position is from bottom, so we start at y and go up for each line
-            line_y = y + (len(fitted_lines) - 1 - i) * line_height
-            c.drawString(x, line_y, line)
+    # Calculate line height using adjusted font size
+    line_height = adjusted_font_size * 1.2  # Add some leading
 
-    except Exception as e:
-        logger.error(f"Error drawing text: {str(e)}")
-        # If all else fails, at least try to render something
-        try:
-            c.setFont("Helvetica", font_size)
-            c.setFillColorRGB(0, 0, 0)  # Black
-            c.drawString(x, y, "Text rendering error")
-        except:
-            pass  # Silently fail if we can't even do that
+    # Draw all lines through a single text object; one BT/ET block with
+    # relative line moves is much cheaper than one drawString per line.
+    # Position is from bottom, so start at the top line and step down.
+    text_obj = c.beginText(x, y + (len(fitted_lines) - 1) * line_height)
+    text_obj.setLeading(line_height)
+    for line in fitted_lines:
+        text_obj.textLine(line)
+    c.drawText(text_obj)
 
 
 def generate_overlay(
@@ -617,6 +949,7 @@ def generate_overlay(
     font_dir=None,
     target_language="vi",
     debug_outline=False,
+    source_bboxes=None,
 ):
     """
     Generate an overlay PDF with white masks and translated text
@@ -628,74 +961,149 @@ def generate_overlay(
         font_dir: Directory containing font files
         target_language: Target language code (e.g., 'vi', 'en', 'ja')
         debug_outline: If True, draw red outlines around white masks for debugging
+        source_bboxes: Optional dict mapping page number to a list of
+            (x0, y0, x1, y1) boxes covering the source text. When given,
+            masks whose paragraph box overlaps none of them are skipped —
+            there is nothing underneath to white out. When None (the
+            default) every mask is drawn, as before.
 
     Returns:
         Path to the generated overlay PDF
     """
+    # Group paragraphs by page
+    pages = _group_by_page(paragraphs)
+
+    return _generate_overlay_from_pages(
+        pages,
+        output_path,
+        page_size,
+        font_dir,
+        target_language,
+        debug_outline,
+        source_bboxes,
+    )
+
+
+def _generate_overlay_from_pages(
+    pages,
+    output_path,
+    page_size=(612, 792),
+    font_dir=None,
+    target_language="vi",
+    debug_outline=False,
+    source_bboxes=None,
+):
+    """
+    Render an overlay PDF from paragraphs already grouped by page number.
+
+    Shared backend for generate_overlay and generate_overlay_from_json so
+    callers that read page-structured JSON can skip the flatten/re-group
+    round trip. See generate_overlay for the source_bboxes mask-skip
+    contract.
+    """
+    out = None
     try:
         # Register necessary fonts
-        register_fonts(font_dir)
+        register_fonts(font_dir, target_language)
 
-        # Create a canvas for PDF generation
-        c = canvas.Canvas(output_path, pagesize=page_size)
-
-        # Group paragraphs by page
-        pages = {}
-        for para in paragraphs:
-            page_num = para.get("page_number", 1)
-            if page_num not in pages:
-                pages[page_num] = []
-            pages[page_num].append(para)
+        # Create a canvas over a buffered writer so ReportLab's stream
+        # writes reach the OS in large chunks
+        out = _open_pdf_output(output_path)
+        c = canvas.Canvas(out, pagesize=page_size, pageCompression=1)
 
         # Process each page
-        for page_num in sorted(pages.keys()):
-            page_paragraphs = pages[page_num]
+        for page_num, page_paragraphs in sorted(pages.items()):
+            page_source_boxes = (
+                source_bboxes.get(page_num) if source_bboxes else None
+            )
 
-            # Process paragraphs on this page
+            # First pass: collect every white mask and resolve each
+            # paragraph's font once, so no mask can cover text drawn later
+            mask_rects = []
+            drawables = []
             for para in page_paragraphs:
-                # Get paragraph data
-                x = para["bounding_box"]["x0"]
-                y = para["bounding_box"]["y0"]
+                # Get paragraph data, binding every bounding-box corner once
+                bbox = para["bounding_box"]
+                x = bbox["x0"]
+                y = bbox["y0"]
+                x1 = bbox["x1"]
+                y1 = bbox["y1"]
 
                 # Calculate width and height from bounding box if not explicitly provided
-                width = para.get(
-                    "width", para["bounding_box"]["x1"] - para["bounding_box"]["x0"]
-                )
-                height = para.get(
-                    "height", para["bounding_box"]["y1"] - para["bounding_box"]["y0"]
-                )
+                width = para.get("width") or (x1 - x)
+                height = para.get("height") or (y1 - y)
 
-                font_name = para.get("font_name", "Helvetica")
                 font_size = para.get("scaled_font_size", para.get("font_size", 10))
                 color = para.get("non_stroking_color")
 
-                # Create white mask to cover original text
-                create_white_mask(c, x, y, width, height, debug_outline=debug_outline)
+                # Record padded mask bounds; overlapping masks are merged
+                # below before drawing. When the caller supplied source
+                # boxes, paragraphs covering no source text need no mask.
+                if page_source_boxes is None or _intersects_any(
+                    x, y, x + width, y + height, page_source_boxes
+                ):
+                    mask_rects.append(
+                        (
+                            x - _MASK_PADDING,
+                            y - _MASK_PADDING,
+                            x + width + _MASK_PADDING,
+                            y + height + _MASK_PADDING,
+                        )
+                    )
 
-                # Draw translated text using fitted lines if available
                 if "fitted_lines" in para and para["fitted_lines"]:
                     # Get target language from paragraph if available, otherwise use default
                     lang = para.get("target_language", target_language)
-                    
-                    # Get appropriate font based on original font and target language
-                    selected_font = get_appropriate_font(para, lang)
-                    
-                    draw_fitted_text(
-                        c,
-                        para,
-                        para["fitted_lines"],
-                        x,
-                        y,
-                        selected_font,
-                        font_size,
-                        color,
-                        target_language=lang,
+
+                    # Resolve the font from the memoized per-(font, language)
+                    # resolver and validate once here instead of per draw call
+                    selected_font = _validate_font(
+                        _resolve_appropriate_font(
+                            para.get("font_name", "Helvetica"), lang
+                        )
+                    )
+
+                    # Carry every field the draw pass needs so it never goes
+                    # back into the paragraph dict
+                    drawables.append(
+                        (
+                            selected_font,
+                            font_size,
+                            _text_rgb(color),
+                            para,
+                            para["fitted_lines"],
+                            x,
+                            y,
+                            color,
+                            lang,
+                        )
                     )
                 else:
                     logger.warning(
                         f"No fitted lines available for paragraph on page {page_num}"
                     )
 
+            # Draw only the merged mask regions (already padded above);
+            # mask-heavy pages go through the shared Form XObject instead of
+            # emitting a full rect per region
+            _draw_merged_masks(c, mask_rects, debug_outline)
+
+            # Second pass: draw text grouped by (font, size, color) so
+            # draw_fitted_text can skip redundant state changes
+            drawables.sort(key=lambda d: (d[0], d[1], d[2]))
+            for selected_font, font_size, _, para, fitted_lines, x, y, color, lang in drawables:
+                draw_fitted_text(
+                    c,
+                    para,
+                    fitted_lines,
+                    x,
+                    y,
+                    selected_font,
+                    font_size,
+                    color,
+                    target_language=lang,
+                )
+
             # Finish the current page
             c.showPage()
 
@@ -707,6 +1115,111 @@ def generate_overlay(
     except Exception as e:
         logger.error(f"Error generating overlay: {str(e)}")
         raise
+    finally:
+        if out is not None:
+            out.close()
+
+
+def _render_overlay_shard(
+    pages, tmp_path, page_size, font_dir, target_language, debug_outline
+):
+    """
+    Worker for generate_overlay_parallel: render a subset of pages to a
+    temporary PDF. Runs in a separate process, so fonts are registered per
+    worker (register_fonts is one-shot per process and touches no network).
+    """
+    return _generate_overlay_from_pages(
+        pages, tmp_path, page_size, font_dir, target_language, debug_outline
+    )
+
+
+def generate_overlay_parallel(
+    paragraphs,
+    output_path,
+    page_size=(612, 792),
+    font_dir=None,
+    target_language="vi",
+    debug_outline=False,
+    max_workers=None,
+):
+    """
+    Generate an overlay PDF with page rendering fanned out across worker
+    processes.
+
+    Pages are independent, so contiguous page ranges are rendered to
+    temporary PDFs in parallel and concatenated in page order. Useful for
+    long documents; falls back to the serial path when only one worker
+    would be used.
+
+    Args:
+        paragraphs: List of paragraph objects with translation data
+        output_path: Path to save the generated overlay PDF
+        page_size: Size of PDF pages as (width, height)
+        font_dir: Directory containing font files
+        target_language: Target language code (e.g., 'vi', 'en', 'ja')
+        debug_outline: If True, draw red outlines around white masks for debugging
+        max_workers: Worker process count (defaults to the CPU count)
+
+    Returns:
+        Path to the generated overlay PDF
+    """
+    from PyPDF2 import PdfReader, PdfWriter
+
+    # Group paragraphs by page
+    pages = _group_by_page(paragraphs)
+
+    page_nums = sorted(pages.keys())
+    workers = min(max_workers or os.cpu_count() or 1, len(page_nums))
+    if workers <= 1:
+        return _generate_overlay_from_pages(
+            pages, output_path, page_size, font_dir, target_language, debug_outline
+        )
+
+    # Shard sorted page numbers into contiguous ranges, one per worker
+    shard_size = -(-len(page_nums) // workers)
+    shards = [
+        {num: pages[num] for num in page_nums[i : i + shard_size]}
+        for i in range(0, len(page_nums), shard_size)
+    ]
+
+    tmp_dir = tempfile.mkdtemp(prefix="overlay_shards_")
+    part_path = output_path + ".part"
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _render_overlay_shard,
+                    shard,
+                    os.path.join(tmp_dir, f"shard_{i:04d}.pdf"),
+                    page_size,
+                    font_dir,
+                    target_language,
+                    debug_outline,
+                )
+                for i, shard in enumerate(shards)
+            ]
+            shard_paths = [f.result() for f in futures]
+
+        # Concatenate shards in page order and publish atomically
+        writer = PdfWriter()
+        for shard_path in shard_paths:
+            writer.append(PdfReader(shard_path))
+        with open(part_path, "wb") as f:
+            writer.write(f)
+        os.replace(part_path, output_path)
+
+        logger.info(
+            f"Generated overlay PDF with {workers} workers: {output_path}"
+        )
+        return output_path
+
+    except Exception as e:
+        logger.error(f"Error generating overlay in parallel: {str(e)}")
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 def generate_overlay_from_json(
@@ -725,27 +1238,24 @@ def generate_overlay_from_json(
     Returns:
         Path to the generated overlay PDF
     """
-    import json
-
     try:
-        # Set logging level to debug for this run
-        logger.setLevel(logging.DEBUG)
-
         logger.info(f"Generating overlay from JSON: {json_path}")
         logger.info(f"Target language: {target_language}")
 
         if font_dir:
             logger.info(f"Using custom font directory: {font_dir}")
 
-        # Load paragraph data from JSON
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # Load paragraph data from JSON; orjson wants raw bytes
+        with open(json_path, "rb") as f:
+            raw = f.read()
+        data = _json_fast.loads(raw) if _json_fast else json.loads(raw)
 
-        # Handle different JSON formats
+        # Handle different JSON formats, grouping paragraphs by page in a
+        # single pass so the overlay backend skips its own re-grouping
+        pages = {}
+        para_count = 0
         if "pages" in data:
-            # Extract paragraphs from pages
             logger.debug("JSON contains 'pages' key, extracting paragraphs")
-            all_paragraphs = []
             for page in data["pages"]:
                 page_num = page.get("page_num", 0)
                 for para in page.get("paragraphs", []):
@@ -755,18 +1265,20 @@ def generate_overlay_from_json(
                     # Add translated_text as text if not present
                     if "text" not in para and "translated_text" in para:
                         para["text"] = para["translated_text"]
-                    all_paragraphs.append(para)
-            paragraphs = all_paragraphs
+                    pages.setdefault(para["page_number"], []).append(para)
+                    para_count += 1
         else:
             # Assume it's a direct list of paragraphs
             logger.debug("JSON assumed to contain paragraphs directly")
-            paragraphs = data
+            for para in data:
+                pages.setdefault(para.get("page_number", 1), []).append(para)
+            para_count = len(data)
 
-        logger.info(f"Processing {len(paragraphs)} paragraphs")
+        logger.info(f"Processing {para_count} paragraphs")
 
         # Generate overlay
-        return generate_overlay(
-            paragraphs, output_path, page_size, font_dir, target_language
+        return _generate_overlay_from_pages(
+            pages, output_path, page_size, font_dir, target_language
         )
 
     except Exception as e:
@@ -785,61 +1297,94 @@ def debug_overlay(paragraphs, output_path, highlight_boxes=False, page_size=(612
         page_size: Size of PDF pages as (width, height)
 
     Returns:
-        Path to the generated debug overlay PDF
+        Path to the generated debug overlay PDF, or None when there is
+        nothing to show
     """
-    try:
-        # Create a canvas for PDF generation
-        c = canvas.Canvas(output_path, pagesize=page_size)
+    # Without highlight boxes the only debug content is fit_method labels;
+    # skip rendering entirely when no paragraph carries one
+    if not highlight_boxes and not any("fit_method" in p for p in paragraphs):
+        logger.info("No debug content to render; skipping debug overlay")
+        return None
+
+    return _debug_overlay_from_pages(
+        _group_by_page(paragraphs), output_path, highlight_boxes, page_size
+    )
 
-        # Group paragraphs by page
-        pages = {}
-        for para in paragraphs:
-            page_num = para.get("page_number", 1)
-            if page_num not in pages:
-                pages[page_num] = []
-            pages[page_num].append(para)
 
-        # Process each page
-        for page_num in sorted(pages.keys()):
-            page_paragraphs = pages[page_num]
+def _debug_overlay_from_pages(
+    pages, output_path, highlight_boxes=False, page_size=(612, 792)
+):
+    """
+    Render the debug overlay from pre-grouped pages, so callers running
+    both the production and debug passes group paragraphs only once.
+    """
+    out = None
+    try:
+        # Create a canvas over a buffered writer, as in the overlay backend
+        out = _open_pdf_output(output_path)
+        c = canvas.Canvas(out, pagesize=page_size, pageCompression=1)
 
-            # Process paragraphs on this page
+        # Process each page
+        for page_num, page_paragraphs in sorted(pages.items()):
+
+            # Box styles are constant, so set them once per page
+            if highlight_boxes:
+                c.setFillColorRGB(0.9, 0.9, 0.5, alpha=0.3)  # Semi-transparent yellow
+                c.setStrokeColorRGB(1, 0, 0)  # Red outline
+
+            # Process paragraphs on this page, deferring labels so the label
+            # font/color state is applied once instead of per paragraph
+            labels = []
+            mask_rects = []
+            box_rects = []
             for para in page_paragraphs:
-                # Get paragraph data
-                x = para["bounding_box"]["x0"]
-                y = para["bounding_box"]["y0"]
+                # Get paragraph data, binding every bounding-box corner once
+                bbox = para["bounding_box"]
+                x = bbox["x0"]
+                y = bbox["y0"]
+                x1 = bbox["x1"]
+                y1 = bbox["y1"]
 
                 # Calculate width and height from bounding box if not explicitly provided
-                width = para.get(
-                    "width", para["bounding_box"]["x1"] - para["bounding_box"]["x0"]
-                )
-                height = para.get(
-                    "height", para["bounding_box"]["y1"] - para["bounding_box"]["y0"]
-                )
+                width = para.get("width") or (x1 - x)
+                height = para.get("height") or (y1 - y)
 
                 if highlight_boxes:
-                    # Draw colored box for debugging
-                    c.setFillColorRGB(
-                        0.9, 0.9, 0.5, alpha=0.3
-                    )  # Semi-transparent yellow
-                    c.setStrokeColorRGB(1, 0, 0)  # Red outline
-                    c.rect(x, y, width, height, fill=1, stroke=1)
+                    # Collect the box; all boxes paint as one path below
+                    box_rects.append((x, y, width, height))
 
                     # Add box coordinates as text
-                    c.setFont("Helvetica", 6)
-                    c.setFillColorRGB(0, 0, 1)
-                    c.drawString(
-                        x, y - 8, f"({x:.1f},{y:.1f}) {width:.1f}x{height:.1f}"
+                    labels.append(
+                        (x, y - 8, f"({x:.1f},{y:.1f}) {width:.1f}x{height:.1f}")
                     )
                 else:
-                    # Create white mask
-                    create_white_mask(c, x, y, width, height)
+                    # Collect white mask bounds (padded like create_white_mask)
+                    mask_rects.append(
+                        (
+                            x - _MASK_PADDING,
+                            y - _MASK_PADDING,
+                            x + width + _MASK_PADDING,
+                            y + height + _MASK_PADDING,
+                        )
+                    )
 
-                # Display fit method
+                # Display fit method (already a string; no formatting pass)
                 if "fit_method" in para:
-                    c.setFont("Helvetica", 6)
-                    c.setFillColorRGB(0, 0, 1)
-                    c.drawString(x + width + 2, y, f"{para['fit_method']}")
+                    labels.append((x + width + 2, y, para["fit_method"]))
+
+            # Paint every debug box in a single chained path
+            _fast_rects(c, box_rects)
+
+            # Draw masks merged, through the shared form on mask-heavy pages
+            if mask_rects:
+                _draw_merged_masks(c, mask_rects)
+
+            # Draw all labels in one font/color state block, on top of boxes
+            if labels:
+                c.setFont("Helvetica", 6)
+                c.setFillColorRGB(0, 0, 1)
+                for label_x, label_y, text in labels:
+                    c.drawString(label_x, label_y, text)
 
             # Finish the current page
             c.showPage()
@@ -852,12 +1397,14 @@ def debug_overlay(paragraphs, output_path, highlight_boxes=False, page_size=(612
     except Exception as e:
         logger.error(f"Error generating debug overlay: {str(e)}")
         raise
+    finally:
+        if out is not None:
+            out.close()
 
 
 # Main function for standalone testing
 if __name__ == "__main__":
     import sys
-    import json
 
     if len(sys.argv) < 3:
         print(
@@ -869,16 +1416,26 @@ if __name__ == "__main__":
     output_path = sys.argv[2]
     font_dir = sys.argv[3] if len(sys.argv) > 3 else None
 
-    # Load paragraph data from JSON
-    with open(json_path, "r", encoding="utf-8") as f:
-        paragraphs = json.load(f)
+    # Load paragraph data from JSON with the fast parser when available
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    paragraphs = _json_fast.loads(raw) if _json_fast else json.loads(raw)
+
+    # Group once; the overlay and debug passes share the result
+    pages = _group_by_page(paragraphs)
 
-    # Generate overlay
-    generate_overlay(paragraphs, output_path, font_dir=font_dir)
+    # Generate overlay, fanning pages out across processes when the
+    # document is long enough for the worker startup cost to pay off
+    if len(pages) > 8:
+        generate_overlay_parallel(paragraphs, output_path, font_dir=font_dir)
+    else:
+        _generate_overlay_from_pages(pages, output_path, font_dir=font_dir)
 
-    # Also generate a debug overlay
-    debug_path = output_path.replace(".pdf", "_debug.pdf")
-    debug_overlay(paragraphs, debug_path, highlight_boxes=True)
+    # Also generate a debug overlay; derive the name from the final path
+    # component only, so a ".pdf" elsewhere in the path is left alone
+    op = Path(output_path)
+    debug_path = str(op.with_name(op.stem + "_debug" + op.suffix))
+    _debug_overlay_from_pages(pages, debug_path, highlight_boxes=True)
 
     print(f"Generated overlay PDF: {output_path}")
     print(f"Generated debug PDF: {debug_path}")
@@ -4,6 +4,7 @@
 import re
 import math
 import logging
+from functools import lru_cache
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.colors import Color
@@ -65,9 +66,14 @@ class TextFittingResult:
         )
 
 
+@lru_cache(maxsize=128)
 def get_noto_font_metrics(font_family, font_style):
     """
     Get character width metrics for Noto fonts.
+
+    Memoized per (font_family, font_style): documents reuse the same few
+    combinations across every line-width estimate, so the normalization
+    string work runs once per pair.
     
     Args:
         font_family: Font family (e.g., "NotoSans", "NotoSerif", "NotoSansJP")
@@ -98,7 +98,9 @@ def translate_pdf_complete(
         # Save extracted data if debug mode
         if debug:
             with open(extracted_json, 'w', encoding='utf-8') as f:
-                json.dump(extracted_data, f, indent=2, ensure_ascii=False)
+                # Char records are __slots__ objects; serialize them as dicts
+                json.dump(extracted_data, f, indent=2, ensure_ascii=False,
+                          default=lambda o: o.to_dict() if hasattr(o, 'to_dict') else str(o))
             logger.info(f"Saved extracted data to: {extracted_json}")
         
         # Step 2: Translate paragraphs